@@ -1,13 +1,17 @@
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File
+from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import timedelta
+from functools import partial
 import os
-import tempfile
+import hashlib
 import logging
 import json
 
@@ -16,20 +20,37 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 导入我们的模块
-from src.database import engine, get_db, Base, User, Product, DailyData
+from src.database import (
+    engine, read_engine, async_read_engine, get_db, get_read_db, get_async_read_db, ASYNC_READS,
+    SessionLocal, ReadSessionLocal, Base, User, run_migrations
+)
 from src.schemas import (
     UserCreate, UserLogin, UserResponse, Token,
-    ProductResponse, ProductDetailResponse, DailyDataResponse,
-    ExcelUploadResponse
+    ProductResponse, ProductDetailResponse, ProductRollupResponse,
+    ProductSummaryPage,
+    ExcelUploadResponse, UploadJobResponse
 )
 from src.auth import (
-    verify_password, get_password_hash, create_access_token,
-    verify_token, ACCESS_TOKEN_EXPIRE_MINUTES
+    create_access_token, verify_token, ACCESS_TOKEN_EXPIRE_MINUTES,
+    user_cache, cache_stats,
+    verify_and_update_password, hash_password, hash_executor, HashQueueFull
+)
+from src.utils import (
+    ingest_excel_files, is_csv_file, save_upload_to_temp, find_previous_upload, record_upload,
+    upload_job_queue, UploadQueueFull, ingest_lock,
+    response_cache, get_dataset_version, serialize_json, make_cached_response, etag_matches,
+    load_product_page, load_product_detail, load_products_days, load_product_summaries,
+    load_product_rollup, load_products_rollup,
+    MAX_PRODUCTS_PAGE_SIZE, PRODUCT_FIELDS, MAX_COMPARE_PRODUCTS, MIN_MAX_POINTS, SUMMARY_SORT_COLUMNS,
+    ROLLUP_BUCKET_ALIASES, MAX_ROLLUP_BUCKET,
+    EXPORT_FORMATS, iter_export_batches, stream_export, import_parquet_file,
+    METRICS_ENABLED, PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, instrument_engine, render_metrics,
+    track_upload, upload_stage
 )
-from src.utils import parse_excel_file, save_excel_data_to_db
 
-# 创建数据库表
+# 创建数据库表并升级已有数据库
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 app = FastAPI(title="库存数据可视化系统")
 
@@ -72,14 +93,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# 性能指标：开启 METRICS_ENABLED 时按路由记录延迟和 SQL 语句数，并通过 /metrics 以 Prometheus 文本格式导出
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    instrument_engine(read_engine)
+    if async_read_engine is not None:
+        instrument_engine(async_read_engine.sync_engine)
+
 # 安全配置
 security = HTTPBearer()
 
 # 依赖注入：获取当前用户
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    token = credentials.credentials
+def _authenticate(db: Session, token: str) -> User:
     username = verify_token(token)
     if username is None:
         raise HTTPException(
@@ -87,54 +116,88 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = db.query(User).filter(User.username == username).first()
+    user = user_cache.get(username)
     if user is None:
-        raise HTTPException(status_code=404, detail="User not found")
+        user = db.query(User).filter(User.username == username).first()
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        # 脱离会话后缓存，后续请求无需再查询 users 表
+        db.expunge(user)
+        user_cache.set(username, user)
     return user
 
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_read_db)):
+    return _authenticate(db, credentials.credentials)
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    return await db.run_sync(_authenticate, credentials.credentials)
+
 # 用户认证相关API
+# 密码哈希队列已满时返回的错误
+HASH_BUSY_ERROR = HTTPException(
+    status_code=503,
+    detail="Authentication service is busy, please retry later",
+    headers={"Retry-After": "1"}
+)
+
+def _find_user(db: Session, **filters) -> Optional[User]:
+    return db.query(User).filter_by(**filters).first()
+
+def _create_user(db: Session, user: UserCreate, hashed_password: str) -> User:
+    db_user = User(
+        username=user.username,
+        email=user.email,
+        hashed_password=hashed_password
+    )
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
 @app.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    # 数据库操作放到线程池，密码哈希放到专用的哈希线程池，都不阻塞事件循环
     try:
         logger.info(f"Register attempt for username: {user.username}, email: {user.email}")
         
         # 检查用户名是否已存在
-        db_user = db.query(User).filter(User.username == user.username).first()
+        db_user = await run_in_threadpool(_find_user, db, username=user.username)
         if db_user:
             raise HTTPException(status_code=400, detail="Username already registered")
         
         # 检查邮箱是否已存在
-        db_user = db.query(User).filter(User.email == user.email).first()
+        db_user = await run_in_threadpool(_find_user, db, email=user.email)
         if db_user:
             raise HTTPException(status_code=400, detail="Email already registered")
         
         # 创建新用户
-        hashed_password = get_password_hash(user.password)
-        db_user = User(
-            username=user.username,
-            email=user.email,
-            hashed_password=hashed_password
-        )
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        hashed_password = await hash_password(user.password)
+        db_user = await run_in_threadpool(_create_user, db, user, hashed_password)
         logger.info(f"User registered successfully: {user.username}")
         return db_user
     
     except HTTPException:
         raise
+    except HashQueueFull:
+        raise HASH_BUSY_ERROR
     except Exception as e:
         logger.error(f"Register error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.post("/login", response_model=Token)
-def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(user: UserLogin, db: Session = Depends(get_db)):
     try:
         logger.info(f"Login attempt for username: {user.username}")
         
         # 验证用户
-        db_user = db.query(User).filter(User.username == user.username).first()
-        if not db_user or not verify_password(user.password, db_user.hashed_password):
+        db_user = await run_in_threadpool(_find_user, db, username=user.username)
+        valid, new_hash = False, None
+        if db_user:
+            valid, new_hash = await verify_and_update_password(user.password, db_user.hashed_password)
+        if not valid:
             logger.warning(f"Login failed for username: {user.username}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -142,6 +205,12 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        # 哈希成本配置变化时透明地重新加密
+        if new_hash:
+            db_user.hashed_password = new_hash
+            await run_in_threadpool(db.commit)
+            logger.info(f"Password hash upgraded for username: {user.username}")
+        
         # 创建访问令牌
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
@@ -152,6 +221,8 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
     
     except HTTPException:
         raise
+    except HashQueueFull:
+        raise HASH_BUSY_ERROR
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -160,113 +231,402 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
 def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
 
+@app.get("/auth/cache-stats")
+def get_auth_cache_stats(current_user: User = Depends(get_current_user)):
+    """令牌、用户和产品数据响应缓存的命中/未命中统计"""
+    return {**cache_stats(), "response_cache": response_cache.stats()}
+
+@app.get("/auth/hash-stats")
+def get_auth_hash_stats(current_user: User = Depends(get_current_user)):
+    """密码哈希线程池的排队和耗时统计"""
+    return hash_executor.stats()
+
 # 产品数据相关API
+# 读接口的会话和用户依赖：ASYNC_READS 开启时使用异步引擎，否则使用同步只读会话并在线程池中查询
+get_read_session = get_async_read_db if ASYNC_READS else get_read_db
+get_current_read_user = get_current_user_async if ASYNC_READS else get_current_user
+
+async def run_read(db, fn, *args):
+    """在只读会话上执行查询函数 fn(session, *args)"""
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
+
+async def cached_json(request: Request, db, key, build) -> Response:
+    """
+    返回按 (接口参数, 数据版本) 缓存的 JSON 响应，带强 ETag 并支持 If-None-Match
+
+    build 为未命中时调用的协程函数，返回 (响应体字节, 额外响应头)。
+    """
+    version = await run_read(db, get_dataset_version)
+    cache_key = (key, version)
+    entry = response_cache.get(cache_key)
+    if entry is None:
+        body, headers = await build()
+        entry = make_cached_response(body, headers)
+        response_cache.set(cache_key, entry)
+
+    # 数据只在导入时变化，客户端每次都需要重新验证
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
 @app.get("/products", response_model=List[ProductResponse])
-def get_products(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    products = db.query(Product).all()
-    return products
+async def get_products(
+    request: Request,
+    after: Optional[str] = None,  # 游标：上一页最后一个产品ID
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PRODUCTS_PAGE_SIZE),  # 为空时返回全部产品
+    q: Optional[str] = None,  # 按产品名称搜索
+    match: str = Query("contains", pattern="^(prefix|contains)$"),
+    fields: Optional[str] = None,  # 逗号分隔的返回字段，如 "id,name"
+    current_user: User = Depends(get_current_read_user),
+    db = Depends(get_read_session)
+):
+    """产品列表，支持游标分页、名称搜索和字段选择；下一页游标放在 X-Next-Cursor 响应头中"""
+    selected = None
+    if fields:
+        selected = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in selected if f not in PRODUCT_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    
+    async def build():
+        products, next_cursor = await run_read(db, load_product_page, after, limit, q, match, selected)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else {}
+        # 只返回所选字段时跳过完整模型的校验
+        return serialize_json(products, None if selected is not None else List[ProductResponse]), headers
+    
+    key = ("products", after, limit, q, match, tuple(selected) if selected is not None else None)
+    return await cached_json(request, db, key, build)
 
-@app.get("/product/{product_id}", response_model=ProductDetailResponse)
-def get_product(product_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
+@app.get("/products/summary", response_model=ProductSummaryPage)
+async def get_product_summaries(
+    request: Request,
+    sort_by: str = Query("total_sales", pattern=f"^({'|'.join(SUMMARY_SORT_COLUMNS)})$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_read_user),
+    db = Depends(get_read_session)
+):
+    """产品汇总列表（总采购/销售金额、库存统计等），支持排序和分页"""
+    async def build():
+        result = await run_read(db, load_product_summaries, sort_by, order == "desc", page, page_size)
+        return serialize_json(result, ProductSummaryPage), {}
     
-    # 获取每日数据
-    daily_data = db.query(DailyData).filter(DailyData.product_id == product_id).order_by(DailyData.day).all()
+    return await cached_json(request, db, ("summary", sort_by, order, page, page_size), build)
+
+@app.get("/product/{product_id}", response_model=ProductDetailResponse)
+async def get_product(
+    request: Request,
+    product_id: str,
+    response_format: str = Query("rows", alias="format", pattern="^(rows|columnar)$"),
+    max_points: Optional[int] = Query(None, ge=MIN_MAX_POINTS),  # 降采样后的最大天数
+    downsample: str = Query("lttb", pattern="^(lttb|minmax)$"),
+    current_user: User = Depends(get_current_read_user),
+    db = Depends(get_read_session)
+):
+    columnar = response_format == "columnar"
     
-    # 转换数据格式
-    days = []
-    for data in daily_data:
-        days.append(DailyDataResponse(
-            day=data.day,
-            inventory=data.inventory,
-            procurement=data.procurement_amount,
-            sales=data.sales_amount
-        ))
+    async def build():
+        detail = await run_read(db, load_product_detail, product_id, columnar, max_points, downsample)
+        if detail is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+        # 列式格式：直接由查询结果构造，不做逐行的模型校验
+        return serialize_json(detail, None if columnar else ProductDetailResponse), {}
     
-    return ProductDetailResponse(
-        id=product.id,
-        name=product.name,
-        opening_inventory=product.opening_inventory,
-        days=days
-    )
+    key = ("product", product_id, response_format, max_points, downsample)
+    return await cached_json(request, db, key, build)
+
+def _parse_product_ids(product_ids: str, limit: Optional[int] = MAX_COMPARE_PRODUCTS) -> List[str]:
+    """解析逗号分隔的产品ID，去重并保持请求中的顺序"""
+    ids = list(dict.fromkeys(pid.strip() for pid in product_ids.split(',') if pid.strip()))
+    if not ids:
+        raise HTTPException(status_code=400, detail="No product IDs provided")
+    if limit is not None and len(ids) > limit:
+        raise HTTPException(status_code=400, detail=f"At most {limit} products can be compared")
+    return ids
+
+def _check_day_range(day_from: Optional[int], day_to: Optional[int]):
+    if day_from is not None and day_to is not None and day_from > day_to:
+        raise HTTPException(status_code=400, detail="day_from must not be greater than day_to")
 
 @app.get("/products/compare")
-def compare_products(
+async def compare_products(
+    request: Request,
     product_ids: str,  # 逗号分隔的产品ID，如 "0000001,0000002"
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    day_from: Optional[int] = Query(None, ge=1),  # 起始天（含）
+    day_to: Optional[int] = Query(None, ge=1),  # 结束天（含）
+    response_format: str = Query("rows", alias="format", pattern="^(rows|columnar)$"),
+    max_points: Optional[int] = Query(None, ge=MIN_MAX_POINTS),  # 每个产品降采样后的最大天数
+    downsample: str = Query("lttb", pattern="^(lttb|minmax)$"),
+    current_user: User = Depends(get_current_read_user),
+    db = Depends(get_read_session)
 ):
     """对比多个产品的数据"""
-    ids = [pid.strip() for pid in product_ids.split(',') if pid.strip()]
-    if not ids:
-        raise HTTPException(status_code=400, detail="No product IDs provided")
+    ids = _parse_product_ids(product_ids)
+    _check_day_range(day_from, day_to)
     
-    result = []
-    for product_id in ids:
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if product:
-            daily_data = db.query(DailyData).filter(DailyData.product_id == product_id).order_by(DailyData.day).all()
-            days = []
-            for data in daily_data:
-                days.append({
-                    "day": data.day,
-                    "inventory": data.inventory,
-                    "procurement": data.procurement_amount,
-                    "sales": data.sales_amount
-                })
-            
-            result.append({
-                "id": product.id,
-                "name": product.name,
-                "days": days
-            })
+    columnar = response_format == "columnar"
     
-    return result
+    async def build():
+        result = await run_read(db, load_products_days, ids, day_from, day_to, columnar, max_points, downsample)
+        return serialize_json(result), {}
+    
+    key = ("compare", tuple(ids), day_from, day_to, response_format, max_points, downsample)
+    return await cached_json(request, db, key, build)
+
+def _parse_bucket(bucket: str) -> int:
+    """汇总粒度：天数或 week / month"""
+    days = ROLLUP_BUCKET_ALIASES.get(bucket) or int(bucket)
+    if not 1 <= days <= MAX_ROLLUP_BUCKET:
+        raise HTTPException(status_code=400, detail=f"bucket must be between 1 and {MAX_ROLLUP_BUCKET} days")
+    return days
+
+@app.get("/product/{product_id}/rollup", response_model=ProductRollupResponse)
+async def get_product_rollup(
+    request: Request,
+    product_id: str,
+    bucket: str = Query("7", pattern=f"^([0-9]+|{'|'.join(ROLLUP_BUCKET_ALIASES)})$"),  # 每桶天数，如 7 或 week
+    day_from: Optional[int] = Query(None, ge=1),
+    day_to: Optional[int] = Query(None, ge=1),
+    response_format: str = Query("rows", alias="format", pattern="^(rows|columnar)$"),
+    current_user: User = Depends(get_current_read_user),
+    db = Depends(get_read_session)
+):
+    """按桶汇总单个产品的期末/平均/最低库存以及采购和销售金额"""
+    bucket_days = _parse_bucket(bucket)
+    _check_day_range(day_from, day_to)
+    columnar = response_format == "columnar"
+    
+    async def build():
+        rollup = await run_read(db, load_product_rollup, product_id, bucket_days, day_from, day_to, columnar)
+        if rollup is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return serialize_json(rollup, None if columnar else ProductRollupResponse), {}
+    
+    key = ("product_rollup", product_id, bucket_days, day_from, day_to, response_format)
+    return await cached_json(request, db, key, build)
+
+@app.get("/products/rollup", response_model=List[ProductRollupResponse])
+async def get_products_rollup(
+    request: Request,
+    product_ids: str,  # 逗号分隔的产品ID
+    bucket: str = Query("7", pattern=f"^([0-9]+|{'|'.join(ROLLUP_BUCKET_ALIASES)})$"),
+    day_from: Optional[int] = Query(None, ge=1),
+    day_to: Optional[int] = Query(None, ge=1),
+    response_format: str = Query("rows", alias="format", pattern="^(rows|columnar)$"),
+    current_user: User = Depends(get_current_read_user),
+    db = Depends(get_read_session)
+):
+    """按桶汇总多个产品，参数与 /product/{product_id}/rollup 相同"""
+    ids = _parse_product_ids(product_ids)
+    bucket_days = _parse_bucket(bucket)
+    _check_day_range(day_from, day_to)
+    columnar = response_format == "columnar"
+    
+    async def build():
+        result = await run_read(db, load_products_rollup, ids, bucket_days, day_from, day_to, columnar)
+        return serialize_json(result, None if columnar else List[ProductRollupResponse]), {}
+    
+    key = ("products_rollup", tuple(ids), bucket_days, day_from, day_to, response_format)
+    return await cached_json(request, db, key, build)
 
 # Excel上传相关API
-@app.post("/upload-excel", response_model=ExcelUploadResponse)
+@app.post(
+    "/upload-excel",
+    response_model=ExcelUploadResponse,
+    responses={202: {"model": UploadJobResponse}}
+)
 async def upload_excel(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    files: List[UploadFile] = File([]),  # 可一次上传多个文件，每个文件的全部工作表都会导入
+    streaming: Optional[bool] = None,  # 为空时按文件大小自动选择
+    background: bool = False,  # 为真时放入后台任务队列，立即返回任务ID
+    force: bool = False,  # 为真时即使相同文件已导入过也重新处理
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """上传Excel文件并解析数据"""
+    """
+    上传一个或多个Excel文件并解析数据，多个工作表在进程池中并行解析后一次写入
+    
+    也接受相同列布局的 CSV / TSV 文件（可 gzip 压缩），使用 C 解析器分块读取，比解析 xlsx 快得多。
+    """
+    uploads = ([file] if file is not None else []) + (files or [])
+    if not uploads:
+        raise HTTPException(status_code=400, detail="No file uploaded")
     # 检查文件类型
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Only Excel files are allowed")
+    for upload in uploads:
+        if not (upload.filename.endswith(('.xlsx', '.xls')) or is_csv_file(upload.filename)):
+            raise HTTPException(status_code=400, detail="Only Excel or CSV/TSV files are allowed")
+    filename = ", ".join(upload.filename for upload in uploads)
     
+    tmp_file_paths = []
     try:
-        # 保存临时文件
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
-        # 解析Excel文件
-        excel_data = parse_excel_file(tmp_file_path)
-        
-        # 保存到数据库
-        result = save_excel_data_to_db(excel_data, db)
-        
-        # 删除临时文件
-        os.unlink(tmp_file_path)
+        with track_upload():
+            # 分块保存临时文件，避免把整个文件读入内存，同时计算内容摘要
+            digests = []
+            with upload_stage('receive'):
+                for upload in uploads:
+                    tmp_file_path, file_digest = await save_upload_to_temp(upload)
+                    tmp_file_paths.append(tmp_file_path)
+                    digests.append(file_digest)
+            # 多个文件按上传顺序合并摘要（顺序决定重复产品以哪个文件为准）
+            digest = digests[0] if len(digests) == 1 else hashlib.sha256(",".join(digests).encode()).hexdigest()
+            
+            # 相同文件已导入且数据未被其他导入修改时，直接返回上次的结果
+            if not force:
+                with upload_stage('dedup'):
+                    previous = await run_in_threadpool(find_previous_upload, db, digest)
+                if previous is not None:
+                    return ExcelUploadResponse(
+                        message="File already imported, returning previous result", duplicate=True, **previous
+                    )
+            
+            if background:
+                job = upload_job_queue.submit(
+                    filename, current_user.username,
+                    partial(_run_upload_job, tmp_file_paths, streaming, digest, filename)
+                )
+                # 临时文件交由后台任务删除
+                tmp_file_paths = []
+                return JSONResponse(status_code=202, content=jsonable_encoder(UploadJobResponse(**job.to_dict())))
+            
+            # 解析和写库都是阻塞操作，放到线程池中执行
+            ingest = partial(_ingest_excel, tmp_file_paths, streaming)
+            result = await run_in_threadpool(_ingest_and_record, ingest, db, digest, filename)
+            
+            return ExcelUploadResponse(message="Excel file uploaded and processed successfully", **result)
         
-        return ExcelUploadResponse(
-            message="Excel file uploaded and processed successfully",
-            products_count=result['products_count'],
-            days_count=result['days_count']
+    except UploadQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many uploads in progress, please retry later",
+            headers={"Retry-After": "5"}
         )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    finally:
+        # 删除临时文件
+        for tmp_file_path in tmp_file_paths:
+            _remove_file(tmp_file_path)
+
+def _remove_file(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+def _ingest_and_record(ingest, db: Session, digest: str, filename: str):
+    """
+    调用 ingest(db, commit=False) 导入文件，并在同一事务中记录文件摘要和导入结果
+    
+    持有 ingest_lock 执行：同步上传和后台任务在不同线程中运行，同一时间只允许一个导入写库。
+    """
+    with ingest_lock:
+        try:
+            result = ingest(db, commit=False)
+            with upload_stage('commit'):
+                record_upload(db, digest, filename, result)
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return result
+
+def _run_upload_job(file_paths: List[str], streaming: Optional[bool], digest: str, filename: str, job):
+    """后台任务：使用独立的数据库会话导入文件，结束后删除临时文件"""
+    db = SessionLocal()
+    try:
+        ingest = partial(_ingest_excel, file_paths, streaming, progress=job.update_progress)
+        with track_upload():
+            return _ingest_and_record(ingest, db, digest, filename)
+    finally:
+        db.close()
+        for file_path in file_paths:
+            _remove_file(file_path)
+
+def _ingest_excel(file_paths: List[str], streaming: Optional[bool], db: Session, commit: bool = True, progress=None):
+    return ingest_excel_files(file_paths, db, streaming, progress=progress, commit=commit)
+
+@app.get("/upload-jobs/{job_id}", response_model=UploadJobResponse)
+def get_upload_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """查询后台导入任务的状态和进度"""
+    job = upload_job_queue.get(job_id)
+    if job is None or job.owner != current_user.username:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return job.to_dict()
+
+# 批量导入导出API
+@app.get("/export")
+def export_data(
+    export_format: str = Query("arrow", alias="format", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    product_ids: Optional[str] = None,  # 逗号分隔的产品ID，为空时导出全部产品
+    current_user: User = Depends(get_current_user)
+):
+    """以 Arrow IPC 流或 Parquet 文件导出产品及每日数据（长表格式），按 record batch 分块流式返回"""
+    ids = _parse_product_ids(product_ids, limit=None) if product_ids else None
+    media_type, extension = EXPORT_FORMATS[export_format]
+    
+    def generate():
+        # 流式响应期间使用独立的只读会话
+        db = ReadSessionLocal()
+        try:
+            yield from stream_export(iter_export_batches(db, ids), export_format)
+        finally:
+            db.close()
+    
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{extension}"'}
+    )
+
+@app.post("/import", response_model=ExcelUploadResponse)
+async def import_data(
+    file: UploadFile = File(...),
+    force: bool = False,  # 为真时即使相同文件已导入过也重新处理
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """导入长表格式（product_id, name, opening_inventory, day, ...）的 Parquet 文件"""
+    if not file.filename.endswith('.parquet'):
+        raise HTTPException(status_code=400, detail="Only Parquet files are allowed")
+    
+    tmp_file_path = None
+    try:
+        with track_upload():
+            with upload_stage('receive'):
+                tmp_file_path, digest = await save_upload_to_temp(file)
+            
+            if not force:
+                with upload_stage('dedup'):
+                    previous = await run_in_threadpool(find_previous_upload, db, digest)
+                if previous is not None:
+                    return ExcelUploadResponse(
+                        message="File already imported, returning previous result", duplicate=True, **previous
+                    )
+            
+            ingest = partial(import_parquet_file, tmp_file_path)
+            result = await run_in_threadpool(_ingest_and_record, ingest, db, digest, file.filename)
+            return ExcelUploadResponse(message="Parquet file imported successfully", **result)
     
     except Exception as e:
-        # 清理临时文件
-        if 'tmp_file_path' in locals():
-            try:
-                os.unlink(tmp_file_path)
-            except:
-                pass
         raise HTTPException(status_code=400, detail=str(e))
+    
+    finally:
+        if tmp_file_path:
+            _remove_file(tmp_file_path)
+
+# 性能指标
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus 文本格式的请求延迟、SQL 语句和上传阶段耗时指标；未开启 METRICS_ENABLED 时返回 404"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
 
 # 健康检查
 @app.get("/")
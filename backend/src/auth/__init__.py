@@ -6,11 +6,19 @@ from .auth import (
     verify_token,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from .cache import user_cache, cache_stats
+from .hashing import verify_and_update_password, hash_password, hash_executor, HashQueueFull
 
 __all__ = [
     'verify_password',
     'get_password_hash', 
     'create_access_token',
     'verify_token',
-    'ACCESS_TOKEN_EXPIRE_MINUTES'
-]
\ No newline at end of file
+    'ACCESS_TOKEN_EXPIRE_MINUTES',
+    'user_cache',
+    'cache_stats',
+    'verify_and_update_password',
+    'hash_password',
+    'hash_executor',
+    'HashQueueFull'
+]
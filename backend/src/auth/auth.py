@@ -2,9 +2,13 @@ from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
+import os
+import time
+from .cache import token_cache
 
-# 密码加密配置
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 密码加密配置，修改 BCRYPT_ROUNDS 后旧密码会在下次登录时自动按新成本重新加密
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # JWT配置
 SECRET_KEY = "your-secret-key-here-change-in-production"  # 生产环境请更换为随机字符串
@@ -31,12 +35,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def verify_token(token: str):
-    """验证令牌"""
+    """验证令牌，解码结果缓存到令牌过期为止"""
+    username = token_cache.get(token)
+    if username is not None:
+        return username
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             return None
+        expires_at = payload.get("exp")
+        token_cache.set(token, username, ttl=expires_at - time.time() if expires_at else None)
         return username
     except JWTError:
-        return None
\ No newline at end of file
+        return None
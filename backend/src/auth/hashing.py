@@ -0,0 +1,91 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from .auth import pwd_context
+
+# 密码哈希专用线程数（bcrypt 是 CPU 密集操作，不应占用处理请求的线程池）
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# 排队和执行中的哈希任务上限，超过后拒绝新请求
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", "64"))
+
+class HashQueueFull(Exception):
+    """密码哈希队列已满"""
+
+class HashingExecutor:
+    """大小固定的密码哈希线程池，记录排队和执行耗时"""
+
+    def __init__(self, workers: int = HASH_WORKERS, limit: int = HASH_QUEUE_LIMIT):
+        self.workers = workers
+        self.limit = limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """在哈希线程池中执行 fn，不阻塞事件循环；队列已满时抛出 HashQueueFull"""
+        with self._lock:
+            if self.pending >= self.limit:
+                self.rejected += 1
+                raise HashQueueFull("Password hashing queue is full")
+            self.pending += 1
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            with self._lock:
+                self.running += 1
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.total_wait += started - submitted
+                    self.max_wait = max(self.max_wait, started - submitted)
+                    self.total_run += finished - started
+
+        try:
+            return await asyncio.wrap_future(self._executor.submit(task))
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "workers": self.workers,
+                "queue_limit": self.limit,
+                "pending": self.pending,
+                "queued": self.pending - self.running,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": self.total_wait / completed * 1000,
+                "max_wait_ms": self.max_wait * 1000,
+                "avg_hash_ms": self.total_run / completed * 1000
+            }
+
+# 全局哈希线程池
+hash_executor = HashingExecutor()
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    验证密码；哈希使用的成本与当前配置不同时，返回用当前配置重新计算的哈希，否则为 None
+    """
+    return await hash_executor.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def hash_password(password: str) -> str:
+    """在哈希线程池中加密密码"""
+    return await hash_executor.run(pwd_context.hash, password)
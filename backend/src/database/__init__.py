@@ -1,13 +1,30 @@
 # Database module
-from .database import engine, get_db, Base, SessionLocal
-from .models import User, Product, DailyData
+from .database import (
+    engine, read_engine, create_db_engine,
+    get_db, get_read_db,
+    Base, SessionLocal, ReadSessionLocal
+)
+from .async_database import ASYNC_READS, async_read_engine, get_async_read_db
+from .models import User, Product, DailyData, ProductSummary, DatasetVersion, UploadRecord
+from .migrations import run_migrations
 
 __all__ = [
     'engine',
-    'get_db', 
+    'read_engine',
+    'create_db_engine',
+    'get_db',
+    'get_read_db',
     'Base',
     'SessionLocal',
+    'ReadSessionLocal',
+    'ASYNC_READS',
+    'async_read_engine',
+    'get_async_read_db',
     'User',
     'Product',
-    'DailyData'
-]
\ No newline at end of file
+    'DailyData',
+    'ProductSummary',
+    'DatasetVersion',
+    'UploadRecord',
+    'run_migrations'
+]
@@ -0,0 +1,52 @@
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from functools import partial
+import os
+from .database import (
+    SQLALCHEMY_READ_DATABASE_URL, DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    _apply_sqlite_pragmas, is_sqlite_memory_url, use_pool_pre_ping
+)
+
+# 为真时读接口使用异步引擎（SQLite 需要安装 aiosqlite）
+ASYNC_READS = os.getenv("ASYNC_READS", "0").lower() in ("1", "true", "yes")
+
+# 同步驱动 -> 异步驱动
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+def to_async_url(url: str) -> str:
+    """将同步连接地址转换为对应异步驱动的地址"""
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme.split('+')[0], scheme)}://{rest}"
+
+def create_async_db_engine(url: str, read_only: bool = True) -> AsyncEngine:
+    """创建异步引擎，SQLite 连接与同步引擎使用相同的 PRAGMA"""
+    async_url = to_async_url(url)
+    is_sqlite = async_url.startswith("sqlite")
+    kwargs = {"pool_pre_ping": use_pool_pre_ping(async_url)}
+    if not (is_sqlite and is_sqlite_memory_url(async_url)):
+        kwargs.update(pool_size=DB_READ_POOL_SIZE, max_overflow=DB_READ_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+        if is_sqlite:
+            # aiosqlite 文件库默认不使用连接池，复用连接可省去每次请求的连接和 PRAGMA 开销
+            kwargs["poolclass"] = AsyncAdaptedQueuePool
+
+    db_engine = create_async_engine(async_url, **kwargs)
+    if is_sqlite:
+        event.listen(db_engine.sync_engine, "connect", partial(_apply_sqlite_pragmas, read_only=read_only))
+    return db_engine
+
+# 只在开启时创建，未安装异步驱动时不影响同步模式
+async_read_engine = create_async_db_engine(SQLALCHEMY_READ_DATABASE_URL) if ASYNC_READS else None
+AsyncReadSessionLocal = (
+    async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+    if ASYNC_READS else None
+)
+
+# 依赖注入：获取异步只读数据库会话
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -1,19 +1,97 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from functools import partial
 import os
 
-# SQLite数据库文件路径
-SQLALCHEMY_DATABASE_URL = "sqlite:///./inventory.db"
+# 数据库连接地址，默认使用当前目录下的SQLite文件
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./inventory.db")
 
-# 创建数据库引擎
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # SQLite特定配置
+# 只读查询使用的连接地址（如只读副本），默认与主库相同
+SQLALCHEMY_READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", SQLALCHEMY_DATABASE_URL)
+
+# 连接池配置：写连接较少（SQLite 同一时间只有一个写者），读连接与请求线程池规模相当
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "20"))
+DB_READ_MAX_OVERFLOW = int(os.getenv("DB_READ_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# 取出连接时先执行 SELECT 1 检查连接是否断开；为空时只对网络数据库开启（本地 SQLite 文件连接不会被服务端断开）
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "").lower()
+
+# SQLite 连接参数，每个新连接建立时设置
+SQLITE_PRAGMAS = {
+    # WAL 模式下读不阻塞写，导入提交时看板仍可读取
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    # 负数表示以 KiB 为单位
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", str(-64 * 1024))),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record, read_only: bool = False):
+    """为新建的 SQLite 连接设置 PRAGMA"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            # 日志模式是数据库文件级别的设置，由读写连接负责
+            if read_only and name == "journal_mode":
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+def is_sqlite_memory_url(url: str) -> bool:
+    """是否为内存中的 SQLite 数据库（每个连接独立，不使用连接池参数）"""
+    return url.split("://", 1)[-1] in ("", "/:memory:") or "mode=memory" in url
+
+def use_pool_pre_ping(url: str) -> bool:
+    """是否为该连接地址开启 pool_pre_ping"""
+    if DB_POOL_PRE_PING:
+        return DB_POOL_PRE_PING in ("1", "true", "yes")
+    return not url.startswith("sqlite")
+
+def create_db_engine(
+    url: str,
+    read_only: bool = False,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW
+) -> Engine:
+    """
+    根据连接地址创建数据库引擎
+
+    SQLite 连接在建立时设置 WAL 等 PRAGMA，read_only 为真时连接只允许查询。
+    """
+    kwargs = {"pool_pre_ping": use_pool_pre_ping(url)}
+    is_sqlite = url.startswith("sqlite")
+    if is_sqlite:
+        kwargs["connect_args"] = {"check_same_thread": False}  # SQLite特定配置
+    if not (is_sqlite and is_sqlite_memory_url(url)):
+        kwargs.update(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=DB_POOL_TIMEOUT)
+
+    db_engine = create_engine(url, **kwargs)
+    if is_sqlite:
+        event.listen(db_engine, "connect", partial(_apply_sqlite_pragmas, read_only=read_only))
+    return db_engine
+
+# 创建数据库引擎：读写引擎用于登录、注册和导入，只读引擎用于查询接口
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
+read_engine = create_db_engine(
+    SQLALCHEMY_READ_DATABASE_URL,
+    read_only=True,
+    pool_size=DB_READ_POOL_SIZE,
+    max_overflow=DB_READ_MAX_OVERFLOW
 )
 
 # 创建会话
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # 创建基类
 Base = declarative_base()
@@ -24,4 +102,12 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# 依赖注入：获取只读数据库会话
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,82 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from .database import engine
+from .models import Product, DailyData, ProductSummary, DatasetVersion
+
+def _ensure_daily_data_index(bind: Engine):
+    """为已有的 daily_data 表补建 (product_id, day) 唯一索引"""
+    index = next(ix for ix in DailyData.__table__.indexes if ix.name == "ix_daily_data_product_day")
+    existing = {ix['name'] for ix in inspect(bind).get_indexes(DailyData.__tablename__)}
+    if index.name in existing:
+        return
+
+    with bind.begin() as conn:
+        # 旧数据可能存在重复的 (product_id, day)，只保留最新写入的一行
+        conn.execute(text(
+            "DELETE FROM daily_data WHERE id NOT IN "
+            "(SELECT MAX(id) FROM daily_data GROUP BY product_id, day)"
+        ))
+        index.create(conn)
+
+def _backfill_product_summaries(bind: Engine):
+    """为还没有汇总数据的产品从 daily_data 计算汇总"""
+    missing = text(
+        "SELECT 1 FROM products p WHERE NOT EXISTS "
+        "(SELECT 1 FROM product_summaries s WHERE s.product_id = p.id) LIMIT 1"
+    )
+    with bind.begin() as conn:
+        if conn.execute(missing).first() is None:
+            return
+        conn.execute(text("""
+            INSERT INTO product_summaries (
+                product_id, days_count, total_procurement_qty, total_sales_qty,
+                total_procurement, total_sales, avg_inventory, min_inventory, max_inventory,
+                stockout_days, last_day, last_inventory, updated_at
+            )
+            SELECT
+                p.id,
+                COUNT(d.id),
+                COALESCE(SUM(d.procurement_qty), 0),
+                COALESCE(SUM(d.sales_qty), 0),
+                COALESCE(SUM(d.procurement_qty * d.procurement_price), 0),
+                COALESCE(SUM(d.sales_qty * d.sales_price), 0),
+                AVG(d.inventory),
+                MIN(d.inventory),
+                MAX(d.inventory),
+                COALESCE(SUM(CASE WHEN d.inventory <= 0 THEN 1 ELSE 0 END), 0),
+                MAX(d.day),
+                (SELECT l.inventory FROM daily_data l WHERE l.product_id = p.id ORDER BY l.day DESC LIMIT 1),
+                CURRENT_TIMESTAMP
+            FROM products p
+            LEFT JOIN daily_data d ON d.product_id = p.id
+            WHERE NOT EXISTS (SELECT 1 FROM product_summaries s WHERE s.product_id = p.id)
+            GROUP BY p.id
+        """))
+
+def _ensure_product_content_hash(bind: Engine):
+    """为已有的 products 表添加 content_hash 列；旧产品的摘要为空，下次导入时按天比较后写入"""
+    columns = {column['name'] for column in inspect(bind).get_columns(Product.__tablename__)}
+    if "content_hash" in columns:
+        return
+    with bind.begin() as conn:
+        conn.execute(text("ALTER TABLE products ADD COLUMN content_hash VARCHAR"))
+
+def _ensure_dataset_version(bind: Engine):
+    """写入数据版本号的初始行"""
+    with bind.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM dataset_version WHERE id = 1")).first() is None:
+            conn.execute(DatasetVersion.__table__.insert(), {"id": 1, "version": 1})
+
+def run_migrations(bind: Engine = engine):
+    """
+    将已有数据库升级到当前模型结构，应在 Base.metadata.create_all 之后调用
+    """
+    inspector = inspect(bind)
+    if inspector.has_table(Product.__tablename__):
+        _ensure_product_content_hash(bind)
+    if inspector.has_table(DailyData.__tablename__):
+        _ensure_daily_data_index(bind)
+    if inspector.has_table(ProductSummary.__tablename__):
+        _backfill_product_summaries(bind)
+    if inspector.has_table(DatasetVersion.__tablename__):
+        _ensure_dataset_version(bind)
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -18,13 +19,20 @@ class Product(Base):
     id = Column(String, primary_key=True, index=True)  # 产品ID如 "0000001"
     name = Column(String, nullable=False)
     opening_inventory = Column(Integer, nullable=False, default=0)
+    # 名称、期初库存和每日数据的摘要，重新导入时内容未变的产品直接跳过
+    content_hash = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # 关系
     daily_data = relationship("DailyData", back_populates="product")
+    summary = relationship("ProductSummary", back_populates="product", uselist=False)
 
 class DailyData(Base):
     __tablename__ = "daily_data"
+    __table_args__ = (
+        # 详情、对比和导入都按 product_id 过滤并按 day 排序
+        Index("ix_daily_data_product_day", "product_id", "day", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(String, ForeignKey("products.id"), nullable=False)
@@ -46,12 +54,65 @@ class DailyData(Base):
     # 关系
     product = relationship("Product", back_populates="daily_data")
     
-    @property
+    # 金额既可在实例上计算，也可作为 SQL 表达式用于查询、SUM 和 GROUP BY
+    @hybrid_property
     def procurement_amount(self):
         """采购金额 = 数量 * 价格"""
         return self.procurement_qty * self.procurement_price
     
-    @property
+    @hybrid_property
     def sales_amount(self):
         """销售金额 = 数量 * 价格"""
-        return self.sales_qty * self.sales_price
\ No newline at end of file
+        return self.sales_qty * self.sales_price
+
+class ProductSummary(Base):
+    """每个产品的汇总数据，导入时随每日数据一起更新，查询时无需扫描 daily_data"""
+    __tablename__ = "product_summaries"
+    
+    product_id = Column(String, ForeignKey("products.id"), primary_key=True)
+    days_count = Column(Integer, nullable=False, default=0)
+    
+    # 采购和销售汇总
+    total_procurement_qty = Column(Integer, nullable=False, default=0)
+    total_sales_qty = Column(Integer, nullable=False, default=0)
+    total_procurement = Column(Float, nullable=False, default=0.0, index=True)  # 采购总金额
+    total_sales = Column(Float, nullable=False, default=0.0, index=True)  # 销售总金额
+    
+    # 库存汇总（没有每日数据时为空）
+    avg_inventory = Column(Float, nullable=True, index=True)
+    min_inventory = Column(Integer, nullable=True)
+    max_inventory = Column(Integer, nullable=True)
+    stockout_days = Column(Integer, nullable=False, default=0, index=True)  # 库存 <= 0 的天数
+    last_day = Column(Integer, nullable=True)
+    last_inventory = Column(Integer, nullable=True)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # 关系
+    product = relationship("Product", back_populates="summary")
+
+class DatasetVersion(Base):
+    """产品数据版本号，每次导入提交时加一，用于响应缓存的失效和 ETag"""
+    __tablename__ = "dataset_version"
+    
+    id = Column(Integer, primary_key=True)  # 只有一行，id 为 1
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class UploadRecord(Base):
+    """已导入文件的内容摘要及导入结果，相同文件再次上传且数据未被其他导入修改时直接返回该结果"""
+    __tablename__ = "upload_records"
+    
+    digest = Column(String, primary_key=True)  # 文件内容的 SHA-256
+    filename = Column(String, nullable=False)
+    
+    # 导入结果
+    products_count = Column(Integer, nullable=False, default=0)
+    updated_count = Column(Integer, nullable=False, default=0)
+    skipped_count = Column(Integer, nullable=False, default=0)
+    days_count = Column(Integer, nullable=False, default=0)
+    days_deleted = Column(Integer, nullable=False, default=0)
+    
+    dataset_version = Column(Integer, nullable=False)  # 导入后的数据版本号
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
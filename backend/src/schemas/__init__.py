@@ -7,7 +7,12 @@ from .schemas import (
     ProductResponse,
     ProductDetailResponse,
     DailyDataResponse,
-    ExcelUploadResponse
+    RollupBucketResponse,
+    ProductRollupResponse,
+    ProductSummaryResponse,
+    ProductSummaryPage,
+    ExcelUploadResponse,
+    UploadJobResponse
 )
 
 __all__ = [
@@ -18,5 +23,10 @@ __all__ = [
     'ProductResponse',
     'ProductDetailResponse',
     'DailyDataResponse',
-    'ExcelUploadResponse'
-]
\ No newline at end of file
+    'RollupBucketResponse',
+    'ProductRollupResponse',
+    'ProductSummaryResponse',
+    'ProductSummaryPage',
+    'ExcelUploadResponse',
+    'UploadJobResponse'
+]
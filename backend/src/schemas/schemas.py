@@ -52,8 +52,65 @@ class ProductDetailResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class RollupBucketResponse(BaseModel):
+    bucket: int  # 桶序号，从 0 开始
+    day_start: int
+    day_end: int
+    days: int  # 桶内有数据的天数
+    inventory_end: int  # 期末库存
+    inventory_avg: float
+    inventory_min: int
+    procurement: float  # 采购金额合计
+    sales: float  # 销售金额合计
+
+class ProductRollupResponse(BaseModel):
+    id: str
+    name: str
+    bucket_days: int
+    buckets: List[RollupBucketResponse]
+
+class ProductSummaryResponse(BaseModel):
+    id: str
+    name: str
+    days_count: int
+    total_procurement_qty: int
+    total_sales_qty: int
+    total_procurement: float  # 采购总金额
+    total_sales: float  # 销售总金额
+    avg_inventory: Optional[float] = None
+    min_inventory: Optional[int] = None
+    max_inventory: Optional[int] = None
+    stockout_days: int  # 库存 <= 0 的天数
+    last_day: Optional[int] = None
+    last_inventory: Optional[int] = None
+
+class ProductSummaryPage(BaseModel):
+    total: int
+    page: int
+    page_size: int
+    items: List[ProductSummaryResponse]
+
 # Excel上传相关模式
 class ExcelUploadResponse(BaseModel):
     message: str
+    products_count: int  # 新增的产品数
+    days_count: int  # 插入或更新的每日数据行数
+    updated_count: int = 0  # 内容有变化的已有产品数
+    skipped_count: int = 0  # 内容未变、跳过的产品数
+    days_deleted: int = 0  # 删除的每日数据行数
+    duplicate: bool = False  # 相同文件已导入过，返回的是上次的结果
+
+class UploadJobResponse(BaseModel):
+    job_id: str
+    filename: str
+    status: str  # queued / running / succeeded / failed
     products_count: int
-    days_count: int
\ No newline at end of file
+    days_count: int
+    updated_count: int = 0
+    skipped_count: int = 0
+    rows_per_second: float
+    elapsed_seconds: float
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
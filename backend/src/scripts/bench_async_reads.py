@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Async vs sync read path load benchmark
+
+Seeds a temporary database, then starts the app under uvicorn twice - once
+with ASYNC_READS=0 (sync sessions in the request threadpool) and once with
+ASYNC_READS=1 (async engine) - and drives /products, /product/{id} and
+/products/compare with many concurrent clients. Reports requests/s and
+latency percentiles for each mode.
+
+Usage:
+    python -m src.scripts.bench_async_reads --products 500 --days 365 --concurrency 200 --requests 3000
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import socket
+import subprocess
+import tempfile
+import time
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import httpx
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed_database(database_url: str, products: int, days: int):
+    """Create the schema, a bench user and `products` x `days` of synthetic data"""
+    os.environ["DATABASE_URL"] = database_url
+    from src.database import Base, SessionLocal, User, engine, run_migrations
+    from src.auth.auth import get_password_hash
+    from src.utils.excel_utils import _parse_products_frame, save_excel_data_to_db
+    from src.scripts.bench_excel_parse import build_scaled_frame
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    db = SessionLocal()
+    db.add(User(username="bench", email="bench@example.com", hashed_password=get_password_hash("bench123")))
+    db.commit()
+    save_excel_data_to_db({'products': _parse_products_frame(build_scaled_frame(products, days))}, db)
+    db.close()
+    engine.dispose()
+
+
+def start_server(database_url: str, async_reads: bool, port: int, workers: int):
+    env = dict(os.environ, DATABASE_URL=database_url, ASYNC_READS="1" if async_reads else "0")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/docs")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def drive(base_url: str, product_ids, args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        token = (await client.post("/login", json={"username": "bench", "password": "bench123"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        rng = random.Random(0)
+
+        def next_request():
+            kind = rng.random()
+            if kind < 0.2:
+                return "/products", {"limit": 100}
+            if kind < 0.8:
+                return f"/product/{rng.choice(product_ids)}", {}
+            return "/products/compare", {"product_ids": ",".join(rng.sample(product_ids, 5)), "max_points": 200}
+
+        requests = [next_request() for _ in range(args.requests)]
+        latencies = []
+        errors = 0
+        queue = iter(requests)
+
+        async def client_loop():
+            nonlocal errors
+            for path, params in queue:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path, params=params, headers=headers)
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies, errors
+
+
+async def run_mode(database_url: str, async_reads: bool, product_ids, args):
+    port = free_port()
+    server = start_server(database_url, async_reads, port, args.workers)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        await wait_until_ready(base_url)
+        return await drive(base_url, product_ids, args)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and async read paths under concurrent load")
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        seed_database(database_url, args.products, args.days)
+        product_ids = [str(i + 1) for i in range(args.products)]
+
+        for async_reads in (False, True):
+            elapsed, latencies, errors = asyncio.run(run_mode(database_url, async_reads, product_ids, args))
+            mode = "async (ASYNC_READS=1)" if async_reads else "sync  (ASYNC_READS=0)"
+            print(f"{mode}: {args.requests / elapsed:7.1f} req/s, "
+                  f"p50 {percentile(latencies, 0.5):7.1f} ms, p95 {percentile(latencies, 0.95):7.1f} ms, "
+                  f"p99 {percentile(latencies, 0.99):7.1f} ms, errors {errors}")
+
+
+if __name__ == "__main__":
+    main()
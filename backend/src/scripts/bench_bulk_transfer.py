@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Bulk transfer benchmark: Excel round trip vs Arrow IPC / Parquet
+
+Seeds a database, then moves the full dataset out and into a fresh
+database three ways:
+
+- excel:   write the wide ProductData.xlsx layout, then ingest_excel_file
+- arrow:   stream_export as Arrow IPC (export only; /import takes Parquet)
+- parquet: stream_export as Parquet, then import_parquet_file
+
+Reports export time, file size and import time for each.
+
+Usage:
+    python -m src.scripts.bench_bulk_transfer --products 2000 --days 90
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base, run_migrations
+from src.utils.arrow_utils import iter_export_batches, stream_export, import_parquet_file
+from src.utils.excel_utils import _parse_products_frame, save_excel_data_to_db, ingest_excel_file
+from src.scripts.bench_excel_parse import build_scaled_frame
+
+
+def make_session(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def export_file(db, export_format: str, path: str):
+    with open(path, 'wb') as f:
+        for chunk in stream_export(iter_export_batches(db), export_format):
+            f.write(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel vs Arrow/Parquet bulk transfer")
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=90)
+    args = parser.parse_args()
+
+    frame = build_scaled_frame(args.products, args.days)
+    rows = args.products * args.days
+    print(f"{args.products} products x {args.days} days ({rows:,} daily rows)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = make_session(os.path.join(tmp_dir, "source.db"))
+        save_excel_data_to_db({'products': _parse_products_frame(frame)}, source)
+
+        # The wide sheet is built from the generator frame; there is no DB-to-Excel export in the app
+        xlsx_path = os.path.join(tmp_dir, "export.xlsx")
+        export_time, _ = timed(lambda: frame.to_excel(xlsx_path, index=False))
+        import_time, _ = timed(ingest_excel_file, xlsx_path, make_session(os.path.join(tmp_dir, "excel.db")))
+        print(f"excel  : export {export_time:7.2f}s, {os.path.getsize(xlsx_path) / 2**20:7.1f} MiB, "
+              f"import {import_time:7.2f}s ({rows / import_time:,.0f} rows/s)")
+
+        arrow_path = os.path.join(tmp_dir, "export.arrow")
+        export_time, _ = timed(export_file, source, 'arrow', arrow_path)
+        print(f"arrow  : export {export_time:7.2f}s, {os.path.getsize(arrow_path) / 2**20:7.1f} MiB")
+
+        parquet_path = os.path.join(tmp_dir, "export.parquet")
+        export_time, _ = timed(export_file, source, 'parquet', parquet_path)
+        import_time, _ = timed(import_parquet_file, parquet_path, make_session(os.path.join(tmp_dir, "parquet.db")))
+        print(f"parquet: export {export_time:7.2f}s, {os.path.getsize(parquet_path) / 2**20:7.1f} MiB, "
+              f"import {import_time:7.2f}s ({rows / import_time:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
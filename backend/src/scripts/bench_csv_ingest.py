@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+CSV / TSV vs Excel ingestion benchmark
+
+Writes the same synthetic ProductData-style sheet as .xlsx, .csv and
+.tsv.gz, checks that all three parse to identical products, then times
+parsing alone and the full ingest into a fresh SQLite database for each.
+
+Usage:
+    python -m src.scripts.bench_csv_ingest --products 2000 --days 90
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base, run_migrations
+from src.utils.excel_utils import parse_excel_file, ingest_excel_file
+from src.utils.csv_utils import parse_csv_file, ingest_csv_file
+from src.scripts.bench_excel_parse import build_scaled_frame
+
+
+def make_session(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV/TSV ingestion against xlsx")
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=90)
+    args = parser.parse_args()
+
+    frame = build_scaled_frame(args.products, args.days)
+    rows = args.products * args.days
+    print(f"{args.products} products x {args.days} days ({rows:,} daily rows)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {
+            'xlsx': os.path.join(tmp_dir, "data.xlsx"),
+            'csv': os.path.join(tmp_dir, "data.csv"),
+            'tsv.gz': os.path.join(tmp_dir, "data.tsv.gz"),
+        }
+        frame.to_excel(paths['xlsx'], index=False)
+        frame.to_csv(paths['csv'], index=False)
+        frame.to_csv(paths['tsv.gz'], index=False, sep='\t', compression='gzip')
+
+        parsers = {
+            'xlsx': lambda path: parse_excel_file(path)['products'],
+            'csv': parse_csv_file,
+            'tsv.gz': parse_csv_file,
+        }
+        ingesters = {'xlsx': ingest_excel_file, 'csv': ingest_csv_file, 'tsv.gz': ingest_csv_file}
+
+        reference = None
+        for name, path in paths.items():
+            parse_time, products = timed(parsers[name], path)
+            if reference is None:
+                reference = products
+            elif products != reference:
+                raise SystemExit(f"{name}: parsed products differ from xlsx")
+            ingest_time, _ = timed(ingesters[name], path, make_session(os.path.join(tmp_dir, f"{name}.db")))
+            print(f"{name:7s}: {os.path.getsize(path) / 2**20:6.1f} MiB, parse {parse_time:6.2f}s "
+                  f"({rows / parse_time:10,.0f} rows/s), ingest {ingest_time:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Database save benchmark
+
+Compares the bulk save_excel_data_to_db path with the legacy per-object ORM
+path on a synthetic sheet, for a fresh load, a re-upload of the same sheet
+and a re-upload where --changed products have one modified day. Reports the
+database file size after each pass.
+
+Usage:
+    python -m src.scripts.bench_db_save --products 2000 --days 90
+    python -m src.scripts.bench_db_save --products 50000 --days 30 --changed 300 --skip-legacy
+"""
+import sys
+import os
+import argparse
+import copy
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base, Product, DailyData
+from src.utils.excel_utils import _parse_products_frame, save_excel_data_to_db
+from src.scripts.bench_excel_parse import build_scaled_frame
+
+
+def legacy_save(excel_data, db):
+    """Per-object reference implementation (the pre-bulk save path)"""
+    products_count = 0
+    days_count = 0
+    for product_data in excel_data['products']:
+        existing_product = db.query(Product).filter(Product.id == product_data['id']).first()
+        if existing_product:
+            db.query(DailyData).filter(DailyData.product_id == product_data['id']).delete()
+            existing_product.name = product_data['name']
+            existing_product.opening_inventory = product_data['opening_inventory']
+        else:
+            db.add(Product(
+                id=product_data['id'],
+                name=product_data['name'],
+                opening_inventory=product_data['opening_inventory']
+            ))
+            products_count += 1
+        for day_data in product_data['days']:
+            db.add(DailyData(product_id=product_data['id'], **day_data))
+            days_count += 1
+    db.commit()
+    return {'products_count': products_count, 'days_count': days_count}
+
+
+def with_changes(excel_data, changed: int):
+    """Copy of the sheet where the first `changed` products have one day with a different sales quantity"""
+    modified = copy.deepcopy(excel_data)
+    for product in modified['products'][:changed]:
+        product['days'][len(product['days']) // 2]['sales_qty'] += 1
+    return modified
+
+
+def run(save_fn, uploads, db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    timings = []
+    for excel_data in uploads:
+        db = Session()
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = save_fn(excel_data, db)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        db.close()
+        timings.append((elapsed, peak, os.path.getsize(db_path), result))
+    engine.dispose()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark database save paths")
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--changed', type=int, default=20)
+    parser.add_argument('--skip-legacy', action='store_true')
+    args = parser.parse_args()
+
+    excel_data = {'products': _parse_products_frame(build_scaled_frame(args.products, args.days))}
+    rows = args.products * args.days
+    print(f"Saving {args.products} products x {args.days} days ({rows:,} rows)")
+
+    uploads = [excel_data, excel_data, with_changes(excel_data, args.changed)]
+    paths = [('bulk', save_excel_data_to_db)]
+    if not args.skip_legacy:
+        paths.append(('legacy', legacy_save))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, save_fn in paths:
+            timings = run(save_fn, uploads, os.path.join(tmp_dir, f"{name}.db"))
+            for label, (elapsed, peak, size, result) in zip(('insert', 'reupload', 'changed'), timings):
+                print(f"{name:6s} {label:8s}: {elapsed:.3f}s ({rows / elapsed:,.0f} rows/s), "
+                      f"peak alloc {peak / 2**20:.1f} MiB, db {size / 2**20:.1f} MiB, {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Product detail loading benchmark: ORM entities vs column tuples
+
+For products with many days, times the former get_product path (load
+DailyData entities, compute amounts through the Python properties) against
+load_product_detail, which selects only the needed columns and computes the
+amounts in SQL. Also checks both paths return the same values.
+
+Usage:
+    python -m src.scripts.bench_detail_columns --days 10000 50000 --samples 20
+"""
+import sys
+import os
+import argparse
+import statistics
+import tempfile
+import time
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database import Base, Product, DailyData, run_migrations
+from src.utils.product_queries import load_product_detail
+
+
+def build_database(path: str, days: int, seed: int = 0):
+    """One product with `days` days of random data"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    rng = np.random.default_rng(seed)
+    with engine.begin() as conn:
+        conn.execute(Product.__table__.insert(), {'id': "0000001", 'name': "PRODUCT 1", 'opening_inventory': 100})
+        conn.execute(DailyData.__table__.insert(), [
+            {
+                'product_id': "0000001", 'day': day, 'inventory': int(inventory),
+                'procurement_qty': int(p_qty), 'procurement_price': float(p_price),
+                'sales_qty': int(s_qty), 'sales_price': float(s_price)
+            }
+            for day, inventory, p_qty, p_price, s_qty, s_price in zip(
+                range(1, days + 1),
+                rng.integers(0, 1000, days), rng.integers(0, 50, days), rng.uniform(1, 5, days).round(2),
+                rng.integers(0, 50, days), rng.uniform(5, 9, days).round(2)
+            )
+        ])
+    return engine
+
+
+def entity_detail(db, product_id: str):
+    """The previous get_product implementation"""
+    product = db.query(Product).filter(Product.id == product_id).first()
+    daily_data = db.query(DailyData).filter(DailyData.product_id == product_id).order_by(DailyData.day).all()
+    return {
+        "id": product.id,
+        "name": product.name,
+        "opening_inventory": product.opening_inventory,
+        "days": [
+            {"day": d.day, "inventory": d.inventory, "procurement": d.procurement_amount, "sales": d.sales_amount}
+            for d in daily_data
+        ]
+    }
+
+
+def time_calls(Session, fn, samples: int):
+    latencies = []
+    for _ in range(samples):
+        db = Session()
+        try:
+            start = time.perf_counter()
+            fn(db)
+            latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close()
+    return statistics.median(latencies), max(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark entity vs column loading for product detail")
+    parser.add_argument('--days', type=int, nargs='+', default=[10000, 50000])
+    parser.add_argument('--samples', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for days in args.days:
+            engine = build_database(os.path.join(tmp_dir, f"bench_{days}.db"), days)
+            Session = sessionmaker(bind=engine)
+
+            db = Session()
+            if entity_detail(db, "0000001") != load_product_detail(db, "0000001"):
+                print(f"{days} days: MISMATCH between entity and column results")
+                sys.exit(1)
+            db.close()
+
+            entity = time_calls(Session, lambda db: entity_detail(db, "0000001"), args.samples)
+            columns = time_calls(Session, lambda db: load_product_detail(db, "0000001"), args.samples)
+            print(f"{days:>7,} days: entities p50 {entity[0]:7.1f} ms (max {entity[1]:7.1f}) | "
+                  f"column tuples p50 {columns[0]:7.1f} ms (max {columns[1]:7.1f}) | "
+                  f"{entity[0] / columns[0]:.1f}x faster")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
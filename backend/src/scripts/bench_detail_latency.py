@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Product detail latency benchmark
+
+Builds daily_data tables of increasing size without the (product_id, day)
+index, times the get_product query, then runs the migration and times it
+again.
+
+Usage:
+    python -m src.scripts.bench_detail_latency --sizes 100000 1000000 --days 365
+"""
+import sys
+import os
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from src.database import Base, Product, DailyData, run_migrations
+
+
+def build_database(path: str, rows: int, days: int):
+    """Create a database with `rows` daily rows and no composite index"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    products = max(1, rows // days)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_daily_data_product_day"))
+        conn.execute(Product.__table__.insert(), [
+            {'id': f"{i:07d}", 'name': f"PRODUCT {i}", 'opening_inventory': 100}
+            for i in range(products)
+        ])
+        batch = []
+        # Interleave products the way repeated uploads do, so rows are not clustered by product
+        for day in range(1, days + 1):
+            for i in range(products):
+                batch.append({
+                    'product_id': f"{i:07d}", 'day': day, 'inventory': 100,
+                    'procurement_qty': 1, 'procurement_price': 1.0, 'sales_qty': 1, 'sales_price': 2.0
+                })
+                if len(batch) >= 50000:
+                    conn.execute(DailyData.__table__.insert(), batch)
+                    batch = []
+        if batch:
+            conn.execute(DailyData.__table__.insert(), batch)
+    return engine, products
+
+
+def time_detail_queries(engine, products: int, samples: int):
+    """Time the get_product daily-data query for random products"""
+    Session = sessionmaker(bind=engine)
+    latencies = []
+    db = Session()
+    try:
+        for _ in range(samples):
+            product_id = f"{random.randrange(products):07d}"
+            start = time.perf_counter()
+            db.query(DailyData).filter(DailyData.product_id == product_id).order_by(DailyData.day).all()
+            latencies.append((time.perf_counter() - start) * 1000)
+            db.expunge_all()
+    finally:
+        db.close()
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark product detail latency vs table size")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 500000])
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--samples', type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in args.sizes:
+            engine, products = build_database(os.path.join(tmp_dir, f"bench_{rows}.db"), rows, args.days)
+            before = time_detail_queries(engine, products, args.samples)
+            start = time.perf_counter()
+            run_migrations(engine)
+            migration = time.perf_counter() - start
+            after = time_detail_queries(engine, products, args.samples)
+            print(f"{rows:>10,} rows: no index p50 {before[0]:8.2f} ms p95 {before[1]:8.2f} ms | "
+                  f"indexed p50 {after[0]:6.2f} ms p95 {after[1]:6.2f} ms | migration {migration:.2f}s")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
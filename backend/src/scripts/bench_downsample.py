@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Downsampling benchmark
+
+Generates long synthetic inventory / procurement / sales series, downsamples
+them with LTTB and min-max, and reports latency, JSON payload size and the
+worst linear-interpolation error per series. The error bounds themselves are
+asserted in tests/test_downsample.py.
+
+Usage:
+    python -m src.scripts.bench_downsample --days 20000 --products 10 --max-points 500 1000
+"""
+import sys
+import os
+import argparse
+import json
+import time
+
+import numpy as np
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.utils.downsample import DOWNSAMPLE_METHODS, downsample_indices
+
+
+def synthetic_series(days: int, rng):
+    """Random-walk inventory with sparse procurement spikes and noisy sales"""
+    procurement_qty = rng.integers(0, 200, size=days) * (rng.random(days) < 0.1)
+    sales_qty = rng.poisson(15, size=days)
+    inventory = 1000 + np.cumsum(procurement_qty - sales_qty)
+    procurement = procurement_qty * rng.uniform(2.0, 4.0, size=days)
+    sales = sales_qty * rng.uniform(4.0, 6.0, size=days)
+    return np.arange(1, days + 1), np.vstack([inventory, procurement, sales]).astype(np.float64)
+
+
+def payload(x, ys, idx):
+    return json.dumps([
+        {"day": int(x[i]), "inventory": ys[0, i], "procurement": ys[1, i], "sales": ys[2, i]}
+        for i in idx
+    ])
+
+
+def reconstruction_error(x, ys, idx):
+    """Max |original - linear interpolation of kept points| per series, as a fraction of the series range"""
+    result = []
+    for y in ys:
+        approx = np.interp(x, x[idx], y[idx])
+        span = np.ptp(y) or 1.0
+        result.append(float(np.abs(approx - y).max() / span))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark server-side downsampling")
+    parser.add_argument('--days', type=int, default=20000)
+    parser.add_argument('--products', type=int, default=10)
+    parser.add_argument('--max-points', type=int, nargs='+', default=[500, 1000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    series = [synthetic_series(args.days, rng) for _ in range(args.products)]
+
+    start = time.perf_counter()
+    full_bytes = sum(len(payload(x, ys, range(len(x)))) for x, ys in series)
+    full_time = time.perf_counter() - start
+    print(f"{args.products} products x {args.days} days: full payload {full_bytes / 2**20:.2f} MiB, "
+          f"serialized in {full_time * 1000:.0f} ms")
+
+    for max_points in args.max_points:
+        for method in DOWNSAMPLE_METHODS:
+            elapsed = 0.0
+            size = 0
+            worst = [0.0, 0.0, 0.0]
+            for x, ys in series:
+                t0 = time.perf_counter()
+                idx = downsample_indices(x, ys, max_points, method)
+                elapsed += time.perf_counter() - t0
+                size += len(payload(x, ys, idx))
+                worst = [max(a, b) for a, b in zip(worst, reconstruction_error(x, ys, idx))]
+            print(f"{method:6s} max_points={max_points:5d}: {elapsed * 1000:7.1f} ms, "
+                  f"payload {size / 2**10:8.1f} KiB ({full_bytes / size:5.1f}x smaller), "
+                  f"max error inventory/procurement/sales = "
+                  + "/".join(f"{e:.1%}" for e in worst))
+
+
+if __name__ == "__main__":
+    main()
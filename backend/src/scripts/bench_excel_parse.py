@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Excel parsing benchmark
+
+Scales ProductData.xlsx synthetically (more products, more days) and compares
+the columnar parser against the legacy per-row iterrows parser.
+
+Usage:
+    python -m src.scripts.bench_excel_parse --products 5000 --days 90
+    python -m src.scripts.bench_excel_parse --products 2000 --days 30 --xlsx
+    python -m src.scripts.bench_excel_parse --products 5000 --days 30 --stream
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.utils.excel_utils import _parse_products_frame, parse_excel_file, iter_excel_batches
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), '../../../ProductData.xlsx')
+
+
+def build_scaled_frame(products: int, days: int, seed: int = 0, sample_file: str = SAMPLE_FILE) -> pd.DataFrame:
+    """Build a wide ProductData-style frame with the given number of products and days"""
+    rng = np.random.default_rng(seed)
+    sample = pd.read_excel(sample_file)
+    base = sample.iloc[np.arange(products) % len(sample)].reset_index(drop=True)
+
+    columns = {
+        'ID': [str(i + 1) for i in range(products)],
+        'Product Name': base['Product Name'].astype(str).to_numpy(),
+        'Opening Inventory': base['Opening Inventory'].to_numpy(),
+    }
+    procurement_qty = rng.integers(0, 50, size=(products, days)) * rng.integers(0, 2, size=(products, days))
+    procurement_price = np.round(rng.uniform(0.5, 20.0, size=(products, days)), 2)
+    sales_qty = rng.integers(0, 30, size=(products, days))
+    sales_price = np.round(procurement_price * rng.uniform(1.1, 1.6, size=(products, days)), 2)
+
+    for day in range(1, days + 1):
+        columns[f'Procurement Qty (Day {day})'] = procurement_qty[:, day - 1]
+        # Half of the price columns are currency strings, as exported by the ERP
+        if day % 2:
+            columns[f'Procurement Price (Day {day})'] = [f"${v:,.2f}" for v in procurement_price[:, day - 1]]
+        else:
+            columns[f'Procurement Price (Day {day})'] = procurement_price[:, day - 1]
+    for day in range(1, days + 1):
+        columns[f'Sales Qty (Day {day})'] = sales_qty[:, day - 1]
+        columns[f'Sales Price (Day {day})'] = sales_price[:, day - 1]
+
+    return pd.DataFrame(columns)
+
+
+def legacy_parse_frame(df: pd.DataFrame):
+    """Per-row reference implementation (the pre-vectorization parser)"""
+    products_data = []
+    for _, row in df.iterrows():
+        opening_inventory = int(row['Opening Inventory'])
+        days_data = []
+        day = 1
+        while True:
+            cols = [f'Procurement Qty (Day {day})', f'Procurement Price (Day {day})',
+                    f'Sales Qty (Day {day})', f'Sales Price (Day {day})']
+            if any(col not in df.columns for col in cols):
+                break
+            procurement_qty = row[cols[0]] if pd.notna(row[cols[0]]) else 0
+            procurement_price_raw = row[cols[1]] if pd.notna(row[cols[1]]) else "$0.00"
+            sales_qty = row[cols[2]] if pd.notna(row[cols[2]]) else 0
+            sales_price_raw = row[cols[3]] if pd.notna(row[cols[3]]) else "$0.00"
+            procurement_price = float(str(procurement_price_raw).replace('$', '').replace(',', '').strip() or 0)
+            sales_price = float(str(sales_price_raw).replace('$', '').replace(',', '').strip() or 0)
+            prev = opening_inventory if day == 1 else days_data[-1]['inventory']
+            days_data.append({
+                'day': day,
+                'inventory': prev + int(procurement_qty) - int(sales_qty),
+                'procurement_qty': int(procurement_qty),
+                'procurement_price': procurement_price,
+                'sales_qty': int(sales_qty),
+                'sales_price': sales_price
+            })
+            day += 1
+        products_data.append({
+            'id': str(row['ID']).strip(),
+            'name': str(row['Product Name']).strip(),
+            'opening_inventory': opening_inventory,
+            'days': days_data
+        })
+    return products_data
+
+
+def rejects_blank_opening_inventory(parse) -> bool:
+    """A row with an empty Opening Inventory cell must be rejected, not saved with a wrapped-around value"""
+    df = build_scaled_frame(2, 3)
+    df['Opening Inventory'] = df['Opening Inventory'].astype(float)
+    df.loc[1, 'Opening Inventory'] = np.nan
+    try:
+        parse(df)
+    except ValueError:
+        return True
+    return False
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def peak_memory(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def consume_batches(path):
+    for _ in iter_excel_batches(path):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel parsing")
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-legacy', action='store_true', help="Do not run the per-row parser")
+    parser.add_argument('--xlsx', action='store_true', help="Also time parse_excel_file on a written workbook")
+    parser.add_argument('--stream', action='store_true', help="Compare peak memory of full vs streaming parsing")
+    args = parser.parse_args()
+
+    df = build_scaled_frame(args.products, args.days, args.seed)
+    cells = args.products * args.days
+    print(f"Frame: {args.products} products x {args.days} days ({cells:,} product-days)")
+
+    if not rejects_blank_opening_inventory(_parse_products_frame):
+        raise SystemExit("columnar parser accepted a blank Opening Inventory")
+    if not args.skip_legacy and not rejects_blank_opening_inventory(legacy_parse_frame):
+        raise SystemExit("legacy parser accepted a blank Opening Inventory")
+
+    columnar, t_columnar = timed(_parse_products_frame, df)
+    print(f"columnar parser: {t_columnar:.3f}s ({cells / t_columnar:,.0f} product-days/s)")
+
+    if not args.skip_legacy:
+        legacy, t_legacy = timed(legacy_parse_frame, df)
+        print(f"legacy parser:   {t_legacy:.3f}s ({cells / t_legacy:,.0f} product-days/s)")
+        print(f"speedup: {t_legacy / t_columnar:.1f}x, identical output: {legacy == columnar}")
+
+    if args.xlsx:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'scaled.xlsx')
+            _, t_write = timed(lambda: df.to_excel(path, index=False))
+            _, t_file = timed(parse_excel_file, path)
+            print(f"xlsx written in {t_write:.3f}s, parse_excel_file: {t_file:.3f}s")
+
+    if args.stream:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'scaled.xlsx')
+            df.to_excel(path, index=False)
+            for name, fn in (('parse_excel_file', parse_excel_file), ('iter_excel_batches', consume_batches)):
+                elapsed, peak = peak_memory(fn, path)
+                print(f"{name:18s}: {elapsed:.3f}s, peak alloc {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+HTTP load benchmark suite
+
+Seeds a temporary database, starts the app under uvicorn and drives each
+scenario in turn at a fixed concurrency:
+
+- login:    POST /login
+- products: GET /products (one page)
+- product:  GET /product/{id} for random products
+- compare:  GET /products/compare for random sets of products
+- upload:   POST /upload-excel (force=true), alternating two workbooks that
+            change the same products so every upload really writes
+
+Results (throughput, error count and latency mean/p50/p95/p99/max per
+scenario, plus the git commit and run parameters) are written as JSON so
+runs can be compared across commits. With --baseline the run is also
+compared against an earlier result file.
+
+Usage:
+    python -m src.scripts.bench_http_load --output bench.json
+    python -m src.scripts.bench_http_load --concurrency 50 --requests 2000 --scenarios product compare
+    python -m src.scripts.bench_http_load --output after.json --baseline before.json
+"""
+import sys
+import os
+import argparse
+import asyncio
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import httpx
+from src.scripts.bench_async_reads import (
+    BACKEND_DIR, percentile, free_port, seed_database, start_server, wait_until_ready
+)
+
+SCENARIOS = ('login', 'products', 'product', 'compare', 'upload')
+
+# Scenarios that hash a password or write the database; they use --slow-requests
+SLOW_SCENARIOS = ('login', 'upload')
+
+CREDENTIALS = {"username": "bench", "password": "bench123"}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_upload_payloads(products: int, days: int):
+    """Two workbooks over the same product IDs with different daily values"""
+    # Imported here: importing src.utils creates the engine, which must happen after seed_database sets DATABASE_URL
+    from src.scripts.bench_excel_parse import build_scaled_frame
+
+    payloads = []
+    for seed in (1, 2):
+        buffer = io.BytesIO()
+        build_scaled_frame(products, days, seed=seed).to_excel(buffer, index=False)
+        payloads.append(buffer.getvalue())
+    return payloads
+
+
+def make_request_factory(scenario: str, product_ids, payloads, args):
+    """Return a function building the i-th request of a scenario as httpx.request kwargs"""
+    rng = random.Random(args.seed)
+
+    if scenario == 'login':
+        return lambda i: {"method": "POST", "url": "/login", "json": CREDENTIALS}
+    if scenario == 'products':
+        return lambda i: {"method": "GET", "url": "/products", "params": {"limit": args.page_size}}
+    if scenario == 'product':
+        return lambda i: {"method": "GET", "url": f"/product/{rng.choice(product_ids)}"}
+    if scenario == 'compare':
+        return lambda i: {
+            "method": "GET", "url": "/products/compare",
+            "params": {"product_ids": ",".join(rng.sample(product_ids, args.compare_size)), "max_points": 200}
+        }
+    return lambda i: {
+        "method": "POST", "url": "/upload-excel", "params": {"force": "true"},
+        "files": {"file": ("bench.xlsx", payloads[i % len(payloads)])}
+    }
+
+
+async def run_scenario(client, headers, make_request, requests: int, concurrency: int, warmup: int):
+    """Send `requests` requests from `concurrency` concurrent clients, after `warmup` untimed ones"""
+    for i in range(warmup):
+        await client.request(headers=headers, **make_request(i))
+
+    latencies = []
+    errors = 0
+    queue = iter(range(requests))
+
+    async def client_loop():
+        nonlocal errors
+        for i in queue:
+            request = make_request(i)
+            start = time.perf_counter()
+            try:
+                response = await client.request(headers=headers, **request)
+            except httpx.TransportError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(max(latencies, default=0.0), 2),
+        }
+    }
+
+
+async def drive(base_url: str, product_ids, payloads, args):
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        token = (await client.post("/login", json=CREDENTIALS)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for scenario in args.scenarios:
+            slow = scenario in SLOW_SCENARIOS
+            requests = args.slow_requests if slow else args.requests
+            concurrency = min(args.concurrency, args.slow_concurrency) if slow else args.concurrency
+            make_request = make_request_factory(scenario, product_ids, payloads, args)
+            results[scenario] = await run_scenario(
+                client, headers, make_request, requests, concurrency, min(args.warmup, requests)
+            )
+            print(f"{scenario:9s}: {format_result(results[scenario])}", file=sys.stderr)
+    return results
+
+
+def format_result(result):
+    latency = result["latency_ms"]
+    return (f"{result['throughput_rps']:8.1f} req/s, p50 {latency['p50']:8.1f} ms, "
+            f"p95 {latency['p95']:8.1f} ms, p99 {latency['p99']:8.1f} ms, errors {result['errors']}")
+
+
+def print_comparison(report, baseline):
+    """Throughput and p95 change of every scenario present in both runs"""
+    print(f"\ncompared with {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}):", file=sys.stderr)
+    for scenario, result in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(scenario)
+        if not before:
+            continue
+        throughput = result["throughput_rps"] / before["throughput_rps"] - 1 if before["throughput_rps"] else 0.0
+        p95 = result["latency_ms"]["p95"] / before["latency_ms"]["p95"] - 1 if before["latency_ms"]["p95"] else 0.0
+        print(f"{scenario:9s}: throughput {throughput:+7.1%}, p95 {p95:+7.1%}", file=sys.stderr)
+
+
+async def run(database_url: str, product_ids, payloads, args):
+    port = free_port()
+    server = start_server(database_url, args.async_reads, port, args.workers)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        await wait_until_ready(base_url)
+        return await drive(base_url, product_ids, payloads, args)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the backend endpoints and report JSON results")
+    parser.add_argument('--products', type=int, default=500, help="seeded products")
+    parser.add_argument('--days', type=int, default=90, help="seeded days per product")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=1000, help="requests per read scenario")
+    parser.add_argument('--slow-requests', type=int, default=50, help="requests for login and upload")
+    parser.add_argument('--slow-concurrency', type=int, default=4, help="concurrency cap for login and upload")
+    parser.add_argument('--warmup', type=int, default=10, help="untimed requests before each scenario")
+    parser.add_argument('--page-size', type=int, default=100, help="/products page size")
+    parser.add_argument('--compare-size', type=int, default=5, help="products per /products/compare request")
+    parser.add_argument('--upload-products', type=int, default=200, help="products in the uploaded workbook")
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument('--async-reads', action='store_true', help="run the server with ASYNC_READS=1")
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    parser.add_argument('--baseline', help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        seed_database(database_url, args.products, args.days)
+        product_ids = [str(i + 1) for i in range(args.products)]
+        payloads = build_upload_payloads(min(args.upload_products, args.products), args.days)
+        scenarios = asyncio.run(run(database_url, product_ids, payloads, args))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "params": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+        },
+        "scenarios": scenarios
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            print_comparison(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
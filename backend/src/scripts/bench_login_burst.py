@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Login burst benchmark
+
+Runs the app in-process against a temporary database and fires a burst of
+concurrent /login requests while other clients keep calling /products.
+Reports login throughput and the latency of the concurrent /products calls.
+
+--baseline runs bcrypt in the shared request threadpool (as the former sync
+login handler did) instead of the dedicated hashing executor.
+
+Usage:
+    python -m src.scripts.bench_login_burst --logins 200 --concurrency 50 --readers 10
+    python -m src.scripts.bench_login_burst --logins 200 --concurrency 50 --readers 10 --baseline
+"""
+import sys
+import os
+import argparse
+import asyncio
+import logging
+import statistics
+import tempfile
+import time
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import httpx
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+async def run(args):
+    import main
+    from fastapi.concurrency import run_in_threadpool
+    from src.auth import hash_executor
+    from src.auth.auth import get_password_hash
+    from src.database import SessionLocal, User
+    from src.utils.excel_utils import _parse_products_frame, save_excel_data_to_db
+    from src.scripts.bench_excel_parse import build_scaled_frame
+
+    # Per-request INFO logs would dominate the measurement
+    logging.getLogger("main").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    db = SessionLocal()
+    db.add(User(username="bench", email="bench@example.com", hashed_password=get_password_hash("bench123")))
+    db.commit()
+    save_excel_data_to_db({'products': _parse_products_frame(build_scaled_frame(args.products, 30))}, db)
+    db.close()
+
+    if args.baseline:
+        async def shared_threadpool(fn, *fn_args):
+            return await run_in_threadpool(fn, *fn_args)
+        hash_executor.run = shared_threadpool
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        token = (await client.post("/login", json={"username": "bench", "password": "bench123"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        done = asyncio.Event()
+        read_latencies = []
+
+        async def reader():
+            while not done.is_set():
+                start = time.perf_counter()
+                response = await client.get("/products", params={"limit": 50}, headers=headers)
+                response.raise_for_status()
+                read_latencies.append((time.perf_counter() - start) * 1000)
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        login_latencies = []
+
+        async def login():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/login", json={"username": "bench", "password": "bench123"})
+                response.raise_for_status()
+                login_latencies.append((time.perf_counter() - start) * 1000)
+
+        readers = [asyncio.create_task(reader()) for _ in range(args.readers)]
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await asyncio.gather(*readers)
+
+    mode = "baseline (shared threadpool)" if args.baseline else "dedicated hashing executor"
+    print(f"mode: {mode}")
+    print(f"logins: {args.logins} in {elapsed:.2f}s ({args.logins / elapsed:.1f}/s), "
+          f"p50 {percentile(login_latencies, 0.5):.0f} ms, p99 {percentile(login_latencies, 0.99):.0f} ms")
+    print(f"/products during burst: {len(read_latencies)} calls, "
+          f"p50 {statistics.median(read_latencies):.1f} ms, p99 {percentile(read_latencies, 0.99):.1f} ms")
+    if not args.baseline:
+        print(f"hash executor: {hash_executor.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login throughput and read latency during a login burst")
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--readers', type=int, default=10)
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--baseline', action='store_true')
+    args = parser.parse_args()
+
+    # The app creates inventory.db in the working directory
+    backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+    sys.path.insert(0, backend_dir)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Parallel multi-sheet / multi-file parsing benchmark
+
+Writes --files workbooks with --sheets sheets each (one per region /
+warehouse), then times parse_excel_files with an increasing number of
+worker processes. Throughput should scale with the number of cores until
+the number of sheets or cores runs out.
+
+Usage:
+    python -m src.scripts.bench_parallel_parse --files 4 --sheets 2 --products 500 --days 90 --workers 1 2 4 8
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import pandas as pd
+from src.utils import parallel_parse
+from src.utils.parallel_parse import parse_excel_files
+from src.scripts.bench_excel_parse import build_scaled_frame
+
+
+def write_workbooks(tmp_dir: str, files: int, sheets: int, products: int, days: int):
+    paths = []
+    for f in range(files):
+        path = os.path.join(tmp_dir, f"region_{f}.xlsx")
+        with pd.ExcelWriter(path) as writer:
+            for s in range(sheets):
+                frame = build_scaled_frame(products, days, seed=f * sheets + s)
+                # Distinct product IDs per sheet so nothing is deduplicated
+                offset = (f * sheets + s) * products
+                frame['ID'] = [str(offset + i + 1) for i in range(products)]
+                frame.to_excel(writer, sheet_name=f"warehouse_{s}", index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark process-pool parsing of many sheets")
+    parser.add_argument('--files', type=int, default=4)
+    parser.add_argument('--sheets', type=int, default=2)
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    rows = args.files * args.sheets * args.products
+    print(f"{args.files} files x {args.sheets} sheets x {args.products} products x {args.days} days "
+          f"({rows:,} product rows), {os.cpu_count()} CPUs")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = write_workbooks(tmp_dir, args.files, args.sheets, args.products, args.days)
+        baseline = None
+        for workers in args.workers:
+            # A fresh pool per setting; the first call also pays for process start-up
+            parallel_parse.PARSE_WORKERS = workers
+            parallel_parse._pool = None
+            parse_excel_files(paths[:1], workers=workers)
+            start = time.perf_counter()
+            products = parse_excel_files(paths, workers=workers)
+            elapsed = time.perf_counter() - start
+            if parallel_parse._pool is not None:
+                parallel_parse._pool.shutdown()
+            baseline = baseline or elapsed
+            print(f"workers={workers:2d}: {elapsed:6.2f}s, {len(products) / elapsed:8,.0f} products/s, "
+                  f"speedup {baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
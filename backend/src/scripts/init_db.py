@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Database initialization script
+
+Creates the default admin user and a small sample dataset. For large
+benchmark databases use src/scripts/seed_synthetic.py instead.
 """
 import sys
 import os
@@ -9,15 +12,16 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 from sqlalchemy.orm import Session
-from src.database import engine, SessionLocal, Base, User, Product, DailyData
+from src.database import engine, SessionLocal, Base, User, Product, DailyData, run_migrations
 from src.auth import get_password_hash
 
 def init_database():
     """Initialize database"""
     print("Initializing database...")
     
-    # Create all tables
+    # Create all tables and upgrade existing databases
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     
     db = SessionLocal()
     try:
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Synthetic data seeder for large-scale benchmark databases
+
+Generates `products` x `days` of realistic inventory data with numpy and
+bulk-loads it (products, daily_data, product_summaries and content
+hashes) into the configured database (DATABASE_URL) in one transaction.
+Optionally writes the same data as a wide ProductData.xlsx-layout
+workbook (or .csv / .tsv / .gz) for ingestion benchmarks.
+
+The series are simulated per product, vectorised across products:
+- sales are Poisson demand with a per-product level, weekly seasonality,
+  a slow trend and occasional promotions (lower price, higher demand),
+  capped by the stock on hand
+- procurement follows a reorder-point / order-up-to policy in case packs,
+  with occasional missed deliveries, so stockouts happen
+- inventory = opening inventory + cumulative (procurement - sales), the
+  same definition the Excel parser uses
+
+Usage:
+    python -m src.scripts.seed_synthetic --products 10000 --days 365 --seed 42
+    python -m src.scripts.seed_synthetic --products 2000 --days 90 --replace --workbook /tmp/ProductData.xlsx
+    python -m src.scripts.seed_synthetic --products 2000 --days 90 --workbook /tmp/data.csv.gz --no-db
+"""
+import sys
+import os
+import argparse
+import time
+from itertools import chain
+
+# Add parent directories to path to access src modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import numpy as np
+import pandas as pd
+
+# Rows generated and sent per executemany call when loading daily_data
+LOAD_BATCH_ROWS = 200_000
+
+# Rows per multi-row INSERT ... VALUES statement (7 parameters each, under SQLite's 999 limit)
+ROWS_PER_STATEMENT = 100
+
+_ADJECTIVES = ("FRESH", "ORGANIC", "FROZEN", "DRIED", "SPICY", "SWEET", "ROASTED", "PREMIUM", "BABY", "WILD")
+_ITEMS = ("CHERRY", "ENOKI MUSHROOM", "RAMEN", "TOFU", "BOK CHOY", "RICE", "GREEN TEA", "DUMPLING",
+          "SOY SAUCE", "KIMCHI", "MANGO", "SEAWEED", "NOODLE", "BEAN SPROUT", "SESAME OIL")
+_PACKS = ("1PACK", "360G", "5P", "500G", "1KG", "2L", "250ML", "12CT")
+
+
+def generate_dataset(products: int, days: int, seed: int = 0):
+    """Return a dict of arrays: ids, names, opening (n,) and the daily (n, days) matrices"""
+    rng = np.random.default_rng(seed)
+    day = np.arange(1, days + 1)
+
+    # Plain integers: the parser infers column types, so a zero-padded ID would be read back from the workbook as "1"
+    ids = [str(i + 1) for i in range(products)]
+    names = [
+        f"{_ADJECTIVES[a]} {_ITEMS[b]} {_PACKS[c]}"
+        for a, b, c in zip(
+            rng.integers(0, len(_ADJECTIVES), products),
+            rng.integers(0, len(_ITEMS), products),
+            rng.integers(0, len(_PACKS), products)
+        )
+    ]
+
+    # Demand: level x weekly seasonality x trend, boosted on promotion days
+    level = rng.lognormal(mean=2.0, sigma=1.0, size=products)
+    weekly = 1 + 0.25 * np.sin(2 * np.pi * day / 7 + rng.uniform(0, 2 * np.pi, (products, 1)))
+    trend = 1 + rng.uniform(-0.3, 0.3, (products, 1)) * day / days
+    promo = rng.random((products, days)) < 0.05
+    demand = rng.poisson(level[:, None] * weekly * trend * np.where(promo, 1.6, 1.0))
+
+    # Replenishment policy: order up to a target when stock falls below the reorder point
+    case_pack = rng.choice([1, 6, 12, 24], size=products)
+    reorder_point = np.ceil(level * rng.uniform(3, 7, products))
+    order_up_to = reorder_point + np.ceil(level * rng.uniform(7, 14, products))
+    missed = rng.random((products, days)) < 0.1
+    opening = np.rint(level * rng.uniform(5, 15, products)).astype(np.int64)
+
+    procurement_qty = np.zeros((products, days), dtype=np.int64)
+    sales_qty = np.zeros((products, days), dtype=np.int64)
+    stock = opening.copy()
+    for t in range(days):
+        order = np.where(
+            (stock < reorder_point) & ~missed[:, t],
+            np.ceil((order_up_to - stock) / case_pack) * case_pack,
+            0
+        ).astype(np.int64)
+        sold = np.minimum(demand[:, t], stock + order)
+        procurement_qty[:, t] = order
+        sales_qty[:, t] = sold
+        stock = stock + order - sold
+    inventory = opening[:, None] + np.cumsum(procurement_qty - sales_qty, axis=1)
+
+    # Prices: per-product unit cost with noise; 0 on days without procurement, as in the ERP export
+    unit_cost = rng.uniform(0.5, 20.0, (products, 1))
+    procurement_price = np.where(
+        procurement_qty > 0, np.round(unit_cost * rng.uniform(0.95, 1.05, (products, days)), 2), 0.0
+    )
+    list_price = np.round(unit_cost * rng.uniform(1.2, 1.8, (products, 1)), 2)
+    sales_price = np.round(np.where(promo, list_price * 0.8, list_price) * np.ones((1, days)), 2)
+
+    return {
+        'ids': ids,
+        'names': names,
+        'opening': opening,
+        'inventory': inventory,
+        'procurement_qty': procurement_qty,
+        'procurement_price': procurement_price,
+        'sales_qty': sales_qty,
+        'sales_price': sales_price,
+    }
+
+
+def load_dataset(db, data, batch_rows: int = LOAD_BATCH_ROWS):
+    """Bulk-insert products, daily_data and product_summaries, then bump the dataset version"""
+    from sqlalchemy import insert
+    from src.database import Product, DailyData, ProductSummary
+    from src.utils.excel_utils import DAILY_VALUE_KEYS, product_content_hashes, summarize_product_matrices
+    from src.utils.response_cache import bump_dataset_version
+
+    n, days = data['inventory'].shape
+    hashes = product_content_hashes(data['names'], data['opening'], data)
+    db.execute(insert(Product), [
+        {'id': product_id, 'name': name, 'opening_inventory': opening, 'content_hash': digest}
+        for product_id, name, opening, digest in zip(data['ids'], data['names'], data['opening'].tolist(), hashes)
+    ])
+
+    # daily_data goes through the DBAPI with flat parameter lists and multi-row VALUES statements:
+    # building millions of dicts, or binding one statement per row, dominates the load time otherwise
+    connection = db.connection()
+    placeholder = '?' if connection.dialect.paramstyle == 'qmark' else '%s'
+    columns = ('product_id',) + DAILY_VALUE_KEYS
+    row_values = f"({', '.join([placeholder] * len(columns))})"
+
+    def statement(rows: int) -> str:
+        return f"INSERT INTO {DailyData.__tablename__} ({', '.join(columns)}) VALUES {', '.join([row_values] * rows)}"
+
+    multi_row_statement = statement(ROWS_PER_STATEMENT)
+    single_row_statement = statement(1)
+    width = len(columns) * ROWS_PER_STATEMENT
+    day_numbers = list(range(1, days + 1))
+    products_per_batch = max(1, batch_rows // max(days, 1))
+    for start in range(0, n, products_per_batch):
+        stop = min(start + products_per_batch, n)
+        matrices = [data[key][start:stop].tolist() for key in DAILY_VALUE_KEYS[1:]]
+        rows = [
+            (product_id, *values)
+            for i, product_id in enumerate(data['ids'][start:stop])
+            for values in zip(day_numbers, *(matrix[i] for matrix in matrices))
+        ]
+        full = len(rows) - len(rows) % ROWS_PER_STATEMENT
+        flat = list(chain.from_iterable(rows[:full]))
+        if flat:
+            connection.exec_driver_sql(
+                multi_row_statement, [tuple(flat[i:i + width]) for i in range(0, len(flat), width)]
+            )
+        if rows[full:]:
+            connection.exec_driver_sql(single_row_statement, rows[full:])
+
+    db.execute(insert(ProductSummary), summarize_product_matrices(data['ids'], data))
+    bump_dataset_version(db)
+
+
+def write_workbook(path: str, data):
+    """Write the data in the ProductData.xlsx wide layout (.xlsx, or .csv / .tsv, optionally .gz)"""
+    from src.utils.excel_utils import DAY_COLUMN_TEMPLATES
+    from src.utils.csv_utils import is_csv_file
+
+    days = data['inventory'].shape[1]
+    columns = {'ID': data['ids'], 'Product Name': data['names'], 'Opening Inventory': data['opening']}
+    for field in ('procurement_qty', 'procurement_price', 'sales_qty', 'sales_price'):
+        for day in range(1, days + 1):
+            columns[DAY_COLUMN_TEMPLATES[field].format(day)] = data[field][:, day - 1]
+    frame = pd.DataFrame(columns)
+
+    if is_csv_file(path):
+        frame.to_csv(path, index=False, sep='\t' if '.tsv' in path.lower() else ',')
+    else:
+        frame.to_excel(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and bulk-load synthetic inventory data")
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--replace', action='store_true', help="delete existing products before loading")
+    parser.add_argument('--workbook', help="also write the data to this .xlsx / .csv / .tsv(.gz) file")
+    parser.add_argument('--no-db', action='store_true', help="only write --workbook, do not touch the database")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = generate_dataset(args.products, args.days, args.seed)
+    rows = args.products * args.days
+    print(f"Generated {args.products:,} products x {args.days} days ({rows:,} daily rows) "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    if not args.no_db:
+        from sqlalchemy import delete, select
+        from src.database import (
+            engine, SessionLocal, Base, Product, DailyData, ProductSummary, UploadRecord, run_migrations
+        )
+
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        db = SessionLocal()
+        try:
+            if db.execute(select(Product.id).limit(1)).first() is not None:
+                if not args.replace:
+                    raise SystemExit("Database already has products; pass --replace to overwrite them")
+                for model in (DailyData, ProductSummary, UploadRecord, Product):
+                    db.execute(delete(model))
+            start = time.perf_counter()
+            load_dataset(db, data)
+            db.commit()
+            elapsed = time.perf_counter() - start
+            print(f"Loaded into {engine.url} in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    if args.workbook:
+        start = time.perf_counter()
+        write_workbook(args.workbook, data)
+        print(f"Wrote {args.workbook} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
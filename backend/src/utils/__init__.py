@@ -1,7 +1,84 @@
 # Utils module
-from .excel_utils import parse_excel_file, save_excel_data_to_db
+from .excel_utils import (
+    parse_excel_file,
+    save_excel_data_to_db,
+    iter_excel_batches,
+    save_excel_stream_to_db,
+    ingest_excel_file
+)
+from .csv_utils import is_csv_file, iter_csv_batches, parse_csv_file, ingest_csv_file, CSV_EXTENSIONS
+from .parallel_parse import parse_excel_files, ingest_excel_files
+from .upload_utils import save_upload_to_temp
+from .upload_jobs import upload_job_queue, UploadQueueFull, ingest_lock
+from .upload_records import find_previous_upload, record_upload
+from .response_cache import (
+    response_cache, get_dataset_version, bump_dataset_version,
+    serialize_json, make_cached_response, etag_matches
+)
+from .metrics import (
+    METRICS_ENABLED, PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, instrument_engine, render_metrics,
+    track_upload, upload_stage
+)
+from .arrow_utils import (
+    iter_export_batches, stream_export, iter_parquet_products, import_parquet_file,
+    EXPORT_FORMATS, LONG_SCHEMA
+)
+from .product_queries import (
+    load_product_page, load_product_detail, load_products_days, load_product_summaries,
+    load_product_rollup, load_products_rollup,
+    MAX_PRODUCTS_PAGE_SIZE, PRODUCT_FIELDS, MAX_COMPARE_PRODUCTS, MIN_MAX_POINTS, SUMMARY_SORT_COLUMNS,
+    ROLLUP_BUCKET_ALIASES, MAX_ROLLUP_BUCKET
+)
 
 __all__ = [
     'parse_excel_file',
-    'save_excel_data_to_db'
-]
\ No newline at end of file
+    'save_excel_data_to_db',
+    'iter_excel_batches',
+    'save_excel_stream_to_db',
+    'ingest_excel_file',
+    'is_csv_file',
+    'iter_csv_batches',
+    'parse_csv_file',
+    'ingest_csv_file',
+    'CSV_EXTENSIONS',
+    'parse_excel_files',
+    'ingest_excel_files',
+    'save_upload_to_temp',
+    'upload_job_queue',
+    'UploadQueueFull',
+    'ingest_lock',
+    'find_previous_upload',
+    'record_upload',
+    'response_cache',
+    'get_dataset_version',
+    'bump_dataset_version',
+    'serialize_json',
+    'make_cached_response',
+    'etag_matches',
+    'METRICS_ENABLED',
+    'PROMETHEUS_CONTENT_TYPE',
+    'MetricsMiddleware',
+    'instrument_engine',
+    'render_metrics',
+    'track_upload',
+    'upload_stage',
+    'iter_export_batches',
+    'stream_export',
+    'iter_parquet_products',
+    'import_parquet_file',
+    'EXPORT_FORMATS',
+    'LONG_SCHEMA',
+    'load_product_page',
+    'load_product_detail',
+    'load_products_days',
+    'load_product_summaries',
+    'load_product_rollup',
+    'load_products_rollup',
+    'MAX_PRODUCTS_PAGE_SIZE',
+    'PRODUCT_FIELDS',
+    'MAX_COMPARE_PRODUCTS',
+    'MIN_MAX_POINTS',
+    'SUMMARY_SORT_COLUMNS',
+    'ROLLUP_BUCKET_ALIASES',
+    'MAX_ROLLUP_BUCKET'
+]
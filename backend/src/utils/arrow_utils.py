@@ -0,0 +1,213 @@
+import io
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..database import Product, DailyData
+from .excel_utils import save_excel_stream_to_db, DAILY_VALUE_KEYS
+
+# 导出时每个 record batch（Parquet 中每个 row group）的行数
+EXPORT_BATCH_ROWS = 50000
+
+# 导入时每次读取的行数
+IMPORT_BATCH_ROWS = 50000
+
+# 长表格式：每个产品每天一行，产品名称和期初库存在每行中重复；没有每日数据的产品为一行，day 等每日字段为空
+LONG_SCHEMA = pa.schema([
+    ('product_id', pa.string()),
+    ('name', pa.string()),
+    ('opening_inventory', pa.int64()),
+    ('day', pa.int64()),
+    ('inventory', pa.int64()),
+    ('procurement_qty', pa.int64()),
+    ('procurement_price', pa.float64()),
+    ('sales_qty', pa.int64()),
+    ('sales_price', pa.float64())
+])
+
+# 导出格式 -> (媒体类型, 文件扩展名)
+EXPORT_FORMATS = {
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrow'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet')
+}
+
+class _ChunkSink(io.RawIOBase):
+    """只写的内存输出，写入的数据由 drain 取出，用于把 Arrow / Parquet 写入器的输出逐块流式返回"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def iter_export_batches(
+    db: Session,
+    product_ids: Optional[List[str]] = None,
+    batch_rows: int = EXPORT_BATCH_ROWS
+) -> Iterator[pa.RecordBatch]:
+    """
+    按 (product_id, day) 顺序逐批读取产品及每日数据，产出长表格式的 record batch
+
+    使用外连接，没有每日数据的产品也会导出（每日字段为空），导出再导入不会丢失产品。
+    """
+    query = (
+        select(
+            Product.id, Product.name, Product.opening_inventory,
+            *(getattr(DailyData, key) for key in DAILY_VALUE_KEYS)
+        )
+        .outerjoin(DailyData, DailyData.product_id == Product.id)
+        .order_by(Product.id, DailyData.day)
+    )
+    if product_ids is not None:
+        query = query.where(Product.id.in_(product_ids))
+
+    result = db.execute(query.execution_options(yield_per=batch_rows))
+    for rows in result.partitions():
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, LONG_SCHEMA)],
+            schema=LONG_SCHEMA
+        )
+
+def stream_export(batches: Iterator[pa.RecordBatch], export_format: str = 'arrow') -> Iterator[bytes]:
+    """把 record batch 写成 Arrow IPC 流或 Parquet 文件，每写入一批就产出已生成的字节"""
+    sink = _ChunkSink()
+    if export_format == 'parquet':
+        writer = pq.ParquetWriter(sink, LONG_SCHEMA, compression='zstd')
+    else:
+        writer = ipc.new_stream(sink, LONG_SCHEMA)
+    try:
+        for batch in batches:
+            if export_format == 'parquet':
+                writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def _products_from_table(table: pa.Table) -> List[Dict[str, Any]]:
+    """把按 product_id 连续排列的长表转换为 save_excel_data_to_db 使用的产品列表"""
+    columns = {name: table.column(name).to_pylist() for name in LONG_SCHEMA.names}
+    product_ids = columns['product_id']
+    day_columns = [columns[key] for key in DAILY_VALUE_KEYS]
+    days = columns['day']
+
+    products = []
+    start = 0
+    for end in range(1, len(product_ids) + 1):
+        if end < len(product_ids) and product_ids[end] == product_ids[start]:
+            continue
+        products.append({
+            'id': product_ids[start],
+            'name': columns['name'][start],
+            'opening_inventory': columns['opening_inventory'][start],
+            # day 为空的行表示产品没有每日数据
+            'days': [
+                dict(zip(DAILY_VALUE_KEYS, values))
+                for values in zip(*(column[start:end] for column in day_columns))
+                if values[0] is not None
+            ]
+        })
+        start = end
+    return products
+
+def _normalize_table(table: pa.Table) -> pa.Table:
+    """按长表格式选择列并转换类型，day 以外的空值按 0 处理（与 Excel 中的空单元格一致）"""
+    missing = [name for name in LONG_SCHEMA.names if name not in table.column_names]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    arrays = []
+    for field in LONG_SCHEMA:
+        column = table.column(field.name).cast(field.type)
+        if field.name not in ('product_id', 'name', 'day'):
+            column = pc.fill_null(column, 0)
+        arrays.append(column)
+    if table.column('product_id').null_count:
+        raise ValueError("product_id must not be empty")
+    return pa.Table.from_arrays(arrays, schema=LONG_SCHEMA)
+
+def _is_grouped(product_ids: pa.ChunkedArray) -> bool:
+    """每个产品的行是否连续排列"""
+    ids = product_ids.to_pylist()
+    seen = set()
+    for i, product_id in enumerate(ids):
+        if i and product_id == ids[i - 1]:
+            continue
+        if product_id in seen:
+            return False
+        seen.add(product_id)
+    return True
+
+def _iter_grouped_products(tables: Iterator[pa.Table]) -> Iterator[List[Dict[str, Any]]]:
+    """依次处理按产品连续排列的表块；块末尾的产品可能延续到下一块，留到下一块一起处理"""
+    pending = None
+    for table in tables:
+        if pending is not None:
+            table = pa.concat_tables([pending, table])
+        ids = table.column('product_id')
+        last_id = ids[-1].as_py()
+        split = table.num_rows
+        while split > 0 and ids[split - 1].as_py() == last_id:
+            split -= 1
+        pending = table.slice(split)
+        if split:
+            yield _products_from_table(table.slice(0, split))
+    if pending is not None and pending.num_rows:
+        yield _products_from_table(pending)
+
+def iter_parquet_products(file_path: str, batch_rows: int = IMPORT_BATCH_ROWS) -> Iterator[List[Dict[str, Any]]]:
+    """
+    逐批读取长表格式的 Parquet 文件并产出产品列表，每个产品的全部天数在同一批中
+
+    行按产品连续排列时逐批流式读取；否则整表读入后按 (product_id, day) 排序再分批。
+    """
+    try:
+        parquet_file = pq.ParquetFile(file_path)
+        missing = [name for name in LONG_SCHEMA.names if name not in parquet_file.schema_arrow.names]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+        if _is_grouped(parquet_file.read(columns=['product_id']).column('product_id')):
+            tables = (
+                _normalize_table(pa.Table.from_batches([batch]))
+                for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=LONG_SCHEMA.names)
+            )
+        else:
+            table = _normalize_table(parquet_file.read(columns=LONG_SCHEMA.names))
+            table = table.sort_by([('product_id', 'ascending'), ('day', 'ascending')])
+            tables = (table.slice(offset, batch_rows) for offset in range(0, table.num_rows, batch_rows))
+        yield from _iter_grouped_products(tables)
+
+    except Exception as e:
+        raise ValueError(f"Error parsing Parquet file: {str(e)}")
+
+def import_parquet_file(
+    file_path: str,
+    db: Session,
+    progress: Optional[Callable[[int, int], None]] = None,
+    commit: bool = True
+) -> Dict[str, int]:
+    """把长表格式的 Parquet 文件逐批写入数据库，与 Excel 导入使用相同的保存逻辑"""
+    return save_excel_stream_to_db(iter_parquet_products(file_path), db, progress=progress, commit=commit)
@@ -0,0 +1,69 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import pandas as pd
+from sqlalchemy.orm import Session
+from .excel_utils import TEXT_COLUMN_DTYPES, _parse_products_frame, save_excel_stream_to_db
+
+# 支持的文本格式扩展名（可再加 .gz 压缩）
+CSV_EXTENSIONS = ('.csv', '.tsv')
+
+# 每次读取的产品行数
+CSV_CHUNK_ROWS = 5000
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+def is_csv_file(filename: str) -> bool:
+    """按扩展名判断是否为 CSV / TSV 文件（包括 .gz 压缩的）"""
+    name = filename.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    return name.endswith(CSV_EXTENSIONS)
+
+def _is_gzip(file_path: str) -> bool:
+    with open(file_path, 'rb') as f:
+        return f.read(2) == _GZIP_MAGIC
+
+def _separator(file_path: str) -> str:
+    """.tsv 为制表符分隔，其余为逗号分隔"""
+    name = file_path.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    return '\t' if name.endswith('.tsv') else ','
+
+def iter_csv_batches(file_path: str, chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[List[Dict[str, Any]]]:
+    """
+    使用 pandas 的 C 解析器分块读取与 ProductData.xlsx 相同宽表布局的 CSV / TSV 文件，逐块产出产品列表
+
+    gzip 压缩按文件头自动识别。ID 和产品名称按文本读入、逐个单元格转换，与分块方式无关，
+    同一份数据无论以 Excel 还是 CSV 上传、分几块读取，解析出的产品ID都一致；数值列的类型推断与 pd.read_excel 相同。
+    """
+    try:
+        reader = pd.read_csv(
+            file_path,
+            sep=_separator(file_path),
+            engine='c',
+            compression='gzip' if _is_gzip(file_path) else None,
+            encoding='utf-8-sig',
+            dtype=TEXT_COLUMN_DTYPES,
+            chunksize=chunk_rows
+        )
+        with reader:
+            for chunk in reader:
+                yield _parse_products_frame(chunk)
+
+    except pd.errors.EmptyDataError:
+        raise ValueError("Error parsing CSV file: file is empty")
+    except Exception as e:
+        raise ValueError(f"Error parsing CSV file: {str(e)}")
+
+def parse_csv_file(file_path: str) -> List[Dict[str, Any]]:
+    """一次解析整个 CSV / TSV 文件，返回产品列表"""
+    return [product for batch in iter_csv_batches(file_path) for product in batch]
+
+def ingest_csv_file(
+    file_path: str,
+    db: Session,
+    progress: Optional[Callable[[int, int], None]] = None,
+    commit: bool = True
+) -> Dict[str, int]:
+    """逐块解析 CSV / TSV 文件并写入数据库，与 Excel 导入使用相同的保存逻辑"""
+    return save_excel_stream_to_db(iter_csv_batches(file_path), db, progress=progress, commit=commit)
@@ -0,0 +1,92 @@
+import numpy as np
+
+# 支持的降采样方法
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+def _normalize(ys: np.ndarray) -> np.ndarray:
+    """将每条序列缩放到 [0, 1]，使多条序列在面积计算中权重相同"""
+    low = ys.min(axis=1, keepdims=True)
+    span = ys.max(axis=1, keepdims=True) - low
+    span[span == 0] = 1.0
+    return (ys - low) / span
+
+def minmax_bucket_size(n: int, n_series: int, max_points: int) -> int:
+    """Min-Max 降采样时每个桶包含的点数（桶覆盖首尾两点之间的点，从下标 1 开始连续划分）"""
+    n_buckets = max(1, (max_points - 2) // (2 * n_series))
+    return -(-(n - 2) // n_buckets)
+
+def minmax_indices(ys: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Min-Max 降采样：把中间的点等分成若干桶，保留每条序列在每个桶中的最小值和最大值所在的点
+
+    ys 形状为 (序列数, 点数)，首尾两点总是保留，返回的下标升序且不超过 max_points 个。
+    每个桶内每条序列的最小值和最大值都被保留，因此任意一个桶范围内的极值与原序列完全相同。
+    """
+    n_series, n = ys.shape
+    if n <= max_points:
+        return np.arange(n)
+
+    interior = n - 2
+    bucket_size = minmax_bucket_size(n, n_series, max_points)
+    n_buckets = -(-interior // bucket_size)
+
+    # 末尾补 NaN 后整形为 (序列数, 桶数, 桶大小)，一次性求出每个桶的极值位置
+    padded = np.full((n_series, n_buckets * bucket_size), np.nan)
+    padded[:, :interior] = ys[:, 1:-1]
+    buckets = padded.reshape(n_series, n_buckets, bucket_size)
+    offsets = 1 + np.arange(n_buckets) * bucket_size
+    picks = np.concatenate([
+        (np.nanargmin(buckets, axis=2) + offsets).ravel(),
+        (np.nanargmax(buckets, axis=2) + offsets).ravel(),
+        [0, n - 1]
+    ])
+    return np.unique(picks)
+
+def lttb_indices(x: np.ndarray, ys: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 降采样，多条序列时按归一化后的三角形面积之和选点
+
+    x 为横坐标（天），ys 形状为 (序列数, 点数)。首尾两点总是保留，返回 max_points 个升序下标。
+    每个桶恰好选一个原始点，相邻两个保留点的间隔不超过两个桶宽，因此对保留点做线性插值时，
+    任意一天的误差不超过原序列在这两个保留点之间的极差。
+    """
+    n = len(x)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    ys = _normalize(ys.astype(np.float64))
+
+    # 中间的点分成 max_points - 2 个桶，边界与下一个桶的均值点一次性算好
+    edges = np.floor(np.linspace(1, n - 1, max_points - 1)).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_ys = np.add.reduceat(ys[:, :n - 1], edges[:-1], axis=1) / counts
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        # 下一个桶的均值点；最后一个桶使用终点
+        if i + 1 < max_points - 2:
+            cx, cy = mean_x[i + 1], mean_ys[:, i + 1]
+        else:
+            cx, cy = x[n - 1], ys[:, n - 1]
+        ax, ay = x[a], ys[:, a]
+        areas = np.abs(
+            (ax - cx) * (ys[:, start:end] - ay[:, None])
+            - (ax - x[start:end]) * (cy - ay)[:, None]
+        ).sum(axis=0)
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+def downsample_indices(x: np.ndarray, ys: np.ndarray, max_points: int, method: str = 'lttb') -> np.ndarray:
+    """按指定方法选出需要保留的点的下标"""
+    if method == 'minmax':
+        return minmax_indices(ys, max_points)
+    if method == 'lttb':
+        return lttb_indices(x, ys, max_points)
+    raise ValueError(f"Unknown downsample method: {method}")
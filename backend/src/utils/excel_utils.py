@@ -1,8 +1,137 @@
+import os
+import hashlib
+from operator import itemgetter
+import numpy as np
 import pandas as pd
-import re
-from typing import Dict, List, Any
+from pandas.io.parsers import TextParser
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional
+from openpyxl import load_workbook
+from sqlalchemy import select, delete, update, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from ..database import Product, DailyData
+from ..database import Product, DailyData, ProductSummary
+from .response_cache import bump_dataset_version
+from .metrics import upload_stage, timed_iter
+
+# 每日数据列的命名模板（字段名 -> 列名）
+DAY_COLUMN_TEMPLATES = {
+    'procurement_qty': 'Procurement Qty (Day {})',
+    'procurement_price': 'Procurement Price (Day {})',
+    'sales_qty': 'Sales Qty (Day {})',
+    'sales_price': 'Sales Price (Day {})',
+}
+
+REQUIRED_COLUMNS = ['ID', 'Product Name', 'Opening Inventory']
+
+# 文本列按原始对象读入（各解析路径都传给 pandas 的 dtype），再由 _text_cell 逐个单元格转换，
+# 不参与按列的类型推断：否则 '0000001' 是否变成 '1' 取决于同一批（块）里的其他行
+TEXT_COLUMN_DTYPES = {'ID': object, 'Product Name': object}
+
+def _text_cell(value: Any) -> str:
+    """文本列单元格转换为字符串：空值为空串，整数值的数字去掉小数部分，两端去掉空白"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def _count_days(columns) -> int:
+    """
+    从第1天开始统计四列齐全的连续天数
+    """
+    columns = set(columns)
+    days = 0
+    while all(template.format(days + 1) in columns for template in DAY_COLUMN_TEMPLATES.values()):
+        days += 1
+    return days
+
+def _to_numeric_matrix(block: pd.DataFrame) -> np.ndarray:
+    """
+    将一组列整体转换为浮点矩阵，空值按0处理，文本列去掉$和千分位逗号
+    """
+    values = np.zeros(block.shape, dtype=np.float64)
+    is_text = (block.dtypes == object).to_numpy()
+
+    if (~is_text).any():
+        values[:, ~is_text] = block.loc[:, ~is_text].to_numpy(dtype=np.float64)
+
+    if is_text.any():
+        text = block.loc[:, is_text]
+        flat = pd.Series(text.to_numpy().ravel())
+        missing = flat.isna().to_numpy()
+        cleaned = (
+            flat.astype(str)
+            .str.replace(r'[$,]', '', regex=True)
+            .str.strip()
+            .replace('', '0')
+        )
+        cleaned[missing] = '0'
+        values[:, is_text] = pd.to_numeric(cleaned).to_numpy(dtype=np.float64).reshape(text.shape)
+
+    return np.nan_to_num(values, nan=0.0)
+
+def _parse_products_frame(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    按列批量解析宽表（每个产品一行、每天四列），返回产品列表
+    """
+    for col in REQUIRED_COLUMNS:
+        if col not in df.columns:
+            raise ValueError(f"Missing required column: {col}")
+
+    product_ids = [_text_cell(value) for value in df['ID'].tolist()]
+    product_names = [_text_cell(value) for value in df['Product Name'].tolist()]
+    opening = pd.to_numeric(df['Opening Inventory']).to_numpy(dtype=np.float64)
+    # 空单元格（NaN）直接转为 int64 会变成极小的负数，必须在转换前拒绝
+    invalid = ~np.isfinite(opening)
+    if invalid.any():
+        raise ValueError(f"Missing Opening Inventory for ID {product_ids[int(np.argmax(invalid))]}")
+    opening = opening.astype(np.int64)
+
+    n_days = _count_days(df.columns)
+    day_numbers = range(1, n_days + 1)
+
+    # 一次性取出所有天的数据，得到 (产品数, 天数) 的矩阵
+    matrices = {
+        field: _to_numeric_matrix(df[[template.format(day) for day in day_numbers]])
+        for field, template in DAY_COLUMN_TEMPLATES.items()
+    }
+    procurement_qty = matrices['procurement_qty'].astype(np.int64)
+    sales_qty = matrices['sales_qty'].astype(np.int64)
+
+    # 库存 = 期初库存 + 按产品累计的（采购数量 - 销售数量）
+    inventory = opening[:, None] + np.cumsum(procurement_qty - sales_qty, axis=1)
+
+    columns = (
+        inventory.tolist(),
+        procurement_qty.tolist(),
+        matrices['procurement_price'].tolist(),
+        sales_qty.tolist(),
+        matrices['sales_price'].tolist(),
+    )
+
+    products_data = []
+    for i, product_id in enumerate(product_ids):
+        days_data = [
+            {
+                'day': day,
+                'inventory': inv,
+                'procurement_qty': p_qty,
+                'procurement_price': p_price,
+                'sales_qty': s_qty,
+                'sales_price': s_price
+            }
+            for day, inv, p_qty, p_price, s_qty, s_price in zip(
+                day_numbers, *(column[i] for column in columns)
+            )
+        ]
+        products_data.append({
+            'id': product_id,
+            'name': product_names[i],
+            'opening_inventory': int(opening[i]),
+            'days': days_data
+        })
+
+    return products_data
 
 def parse_excel_file(file_path: str) -> Dict[str, Any]:
     """
@@ -10,73 +139,10 @@ def parse_excel_file(file_path: str) -> Dict[str, Any]:
     """
     try:
         # 读取Excel文件
-        df = pd.read_excel(file_path)
-        
-        # 检查必要的列
-        required_columns = ['ID', 'Product Name', 'Opening Inventory']
-        for col in required_columns:
-            if col not in df.columns:
-                raise ValueError(f"Missing required column: {col}")
-        
-        products_data = []
-        
-        for _, row in df.iterrows():
-            product_id = str(row['ID']).strip()
-            product_name = str(row['Product Name']).strip()
-            opening_inventory = int(row['Opening Inventory'])
-            
-            # 解析每天的数据
-            days_data = []
-            day = 1
-            
-            while True:
-                # 检查是否还有这一天的数据
-                procurement_qty_col = f'Procurement Qty (Day {day})'
-                procurement_price_col = f'Procurement Price (Day {day})'
-                sales_qty_col = f'Sales Qty (Day {day})'
-                sales_price_col = f'Sales Price (Day {day})'
-                
-                if (procurement_qty_col not in df.columns or 
-                    procurement_price_col not in df.columns or
-                    sales_qty_col not in df.columns or
-                    sales_price_col not in df.columns):
-                    break
-                
-                # 获取数据
-                procurement_qty = row[procurement_qty_col] if pd.notna(row[procurement_qty_col]) else 0
-                procurement_price_raw = row[procurement_price_col] if pd.notna(row[procurement_price_col]) else "$0.00"
-                sales_qty = row[sales_qty_col] if pd.notna(row[sales_qty_col]) else 0
-                sales_price_raw = row[sales_price_col] if pd.notna(row[sales_price_col]) else "$0.00"
-                
-                # 解析价格（去掉$符号）
-                procurement_price = float(str(procurement_price_raw).replace('$', '').replace(',', '').strip() or 0)
-                sales_price = float(str(sales_price_raw).replace('$', '').replace(',', '').strip() or 0)
-                
-                # 计算库存（这里简化处理，实际应该根据业务逻辑计算）
-                if day == 1:
-                    inventory = opening_inventory + int(procurement_qty) - int(sales_qty)
-                else:
-                    prev_inventory = days_data[-1]['inventory']
-                    inventory = prev_inventory + int(procurement_qty) - int(sales_qty)
-                
-                days_data.append({
-                    'day': day,
-                    'inventory': inventory,
-                    'procurement_qty': int(procurement_qty),
-                    'procurement_price': procurement_price,
-                    'sales_qty': int(sales_qty),
-                    'sales_price': sales_price
-                })
-                
-                day += 1
-            
-            products_data.append({
-                'id': product_id,
-                'name': product_name,
-                'opening_inventory': opening_inventory,
-                'days': days_data
-            })
-        
+        df = pd.read_excel(file_path, dtype=TEXT_COLUMN_DTYPES)
+
+        products_data = _parse_products_frame(df)
+
         return {
             'products': products_data,
             'products_count': len(products_data),
@@ -86,53 +152,356 @@ def parse_excel_file(file_path: str) -> Dict[str, Any]:
     except Exception as e:
         raise ValueError(f"Error parsing Excel file: {str(e)}")
 
-def save_excel_data_to_db(excel_data: Dict[str, Any], db: Session):
+# 流式解析时每批处理的产品行数
+STREAM_BATCH_ROWS = 1000
+
+# 超过该大小的 .xlsx 文件自动使用流式解析
+STREAMING_THRESHOLD_BYTES = 20 * 1024 * 1024
+
+def _convert_excel_value(value: Any) -> Any:
+    """与 pd.read_excel 一致地转换单元格：空单元格为空串，整数值的浮点数转为整数"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def iter_excel_batches(
+    file_path: str,
+    batch_rows: int = STREAM_BATCH_ROWS,
+    sheet_name: Optional[str] = None
+) -> Iterator[List[Dict[str, Any]]]:
     """
-    将Excel数据保存到数据库
+    以只读模式逐行读取 .xlsx 文件的一个工作表（默认为活动工作表），每 batch_rows 行解析一次并产出产品列表
+
+    不会一次性加载整个工作簿，内存占用只与批大小有关。ID 和产品名称逐个单元格转换，与分批方式无关；
+    数值列每批的类型推断与 pd.read_excel 相同。
     """
     try:
-        products_count = 0
-        days_count = 0
-        
-        for product_data in excel_data['products']:
-            # 检查产品是否已存在
-            existing_product = db.query(Product).filter(Product.id == product_data['id']).first()
-            if existing_product:
-                # 删除现有的每日数据
-                db.query(DailyData).filter(DailyData.product_id == product_data['id']).delete()
-                # 更新产品信息
-                existing_product.name = product_data['name']
-                existing_product.opening_inventory = product_data['opening_inventory']
-            else:
-                # 创建新产品
-                new_product = Product(
-                    id=product_data['id'],
-                    name=product_data['name'],
-                    opening_inventory=product_data['opening_inventory']
-                )
-                db.add(new_product)
-                products_count += 1
-            
-            # 添加每日数据
-            for day_data in product_data['days']:
-                daily_data = DailyData(
-                    product_id=product_data['id'],
-                    day=day_data['day'],
-                    inventory=day_data['inventory'],
-                    procurement_qty=day_data['procurement_qty'],
-                    procurement_price=day_data['procurement_price'],
-                    sales_qty=day_data['sales_qty'],
-                    sales_price=day_data['sales_price']
-                )
-                db.add(daily_data)
-                days_count += 1
-        
-        db.commit()
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active if sheet_name is None else workbook[sheet_name]
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            # 去掉表头末尾的空单元格，数据行按表头宽度截断或补齐
+            width = max((i + 1 for i, c in enumerate(header) if c is not None), default=0)
+            header = [_convert_excel_value(c) for c in header[:width]]
+            for col in REQUIRED_COLUMNS:
+                if col not in header:
+                    raise ValueError(f"Missing required column: {col}")
+            padding = (None,) * width
+
+            def parse_batch(batch):
+                return _parse_products_frame(TextParser([header] + batch, header=0, dtype=TEXT_COLUMN_DTYPES).read())
+
+            batch = []
+            for row in rows:
+                row = (row[:width] + padding)[:width]
+                # 跳过空行
+                if all(value is None for value in row):
+                    continue
+                batch.append([_convert_excel_value(value) for value in row])
+                if len(batch) >= batch_rows:
+                    yield parse_batch(batch)
+                    batch = []
+            if batch:
+                yield parse_batch(batch)
+        finally:
+            workbook.close()
+
+    except Exception as e:
+        raise ValueError(f"Error parsing Excel file: {str(e)}")
+
+# 每批写入的每日数据行数
+BULK_INSERT_BATCH_SIZE = 5000
+
+# 单条 IN 查询中的最大参数个数（低于 SQLite 的变量数限制）
+IN_CLAUSE_CHUNK_SIZE = 500
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """按固定大小切分列表"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# 每日数据中参与比较和摘要的字段
+DAILY_VALUE_KEYS = ('day', 'inventory', 'procurement_qty', 'procurement_price', 'sales_qty', 'sales_price')
+_daily_values = itemgetter(*DAILY_VALUE_KEYS)
+
+def _iter_daily_rows(products: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """将产品的每日数据展开为 daily_data 表的行"""
+    for product_data in products:
+        product_id = product_data['id']
+        for day_data in product_data['days']:
+            yield {
+                'product_id': product_id,
+                'day': day_data['day'],
+                'inventory': day_data['inventory'],
+                'procurement_qty': day_data['procurement_qty'],
+                'procurement_price': day_data['procurement_price'],
+                'sales_qty': day_data['sales_qty'],
+                'sales_price': day_data['sales_price']
+            }
+
+def _summarize_product(product_data: Dict[str, Any]) -> Dict[str, Any]:
+    """计算一个产品的汇总数据（product_summaries 表的一行）"""
+    days = product_data['days']
+    inventories = [d['inventory'] for d in days]
+    last = max(days, key=lambda d: d['day']) if days else None
+    return {
+        'product_id': product_data['id'],
+        'days_count': len(days),
+        'total_procurement_qty': sum(d['procurement_qty'] for d in days),
+        'total_sales_qty': sum(d['sales_qty'] for d in days),
+        'total_procurement': sum(d['procurement_qty'] * d['procurement_price'] for d in days),
+        'total_sales': sum(d['sales_qty'] * d['sales_price'] for d in days),
+        'avg_inventory': sum(inventories) / len(inventories) if inventories else None,
+        'min_inventory': min(inventories, default=None),
+        'max_inventory': max(inventories, default=None),
+        'stockout_days': sum(1 for inventory in inventories if inventory <= 0),
+        'last_day': last['day'] if last else None,
+        'last_inventory': last['inventory'] if last else None
+    }
+
+def summarize_product_matrices(product_ids: List[str], daily: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """
+    _summarize_product 的矩阵版本，用于批量生成的数据
+
+    daily 为 DAILY_VALUE_KEYS 中除 day 以外各字段的 (产品数, 天数) 矩阵，第 j 列为第 j+1 天。
+    """
+    inventory = np.asarray(daily['inventory'])
+    days = inventory.shape[1]
+    if not days:
+        return [_summarize_product({'id': product_id, 'days': []}) for product_id in product_ids]
+    columns = {
+        'total_procurement_qty': np.sum(daily['procurement_qty'], axis=1).tolist(),
+        'total_sales_qty': np.sum(daily['sales_qty'], axis=1).tolist(),
+        'total_procurement': np.sum(np.multiply(daily['procurement_qty'], daily['procurement_price']), axis=1).tolist(),
+        'total_sales': np.sum(np.multiply(daily['sales_qty'], daily['sales_price']), axis=1).tolist(),
+        'avg_inventory': inventory.mean(axis=1).tolist(),
+        'min_inventory': inventory.min(axis=1).tolist(),
+        'max_inventory': inventory.max(axis=1).tolist(),
+        'stockout_days': (inventory <= 0).sum(axis=1).tolist(),
+        'last_inventory': inventory[:, -1].tolist(),
+    }
+    return [
+        {'product_id': product_id, 'days_count': days, 'last_day': days,
+         **{key: values[i] for key, values in columns.items()}}
+        for i, product_id in enumerate(product_ids)
+    ]
+
+# save_excel_data_to_db 返回的计数
+SAVE_RESULT_KEYS = ('products_count', 'updated_count', 'skipped_count', 'days_count', 'days_deleted')
+
+def _content_hash(name: str, opening_inventory: int, values: np.ndarray) -> str:
+    digest = hashlib.blake2b(repr((name, opening_inventory)).encode('utf-8'), digest_size=16)
+    # 每日数据按 float64 打包后整体计算摘要，比逐个数值 repr 快得多
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+def product_content_hash(product_data: Dict[str, Any]) -> str:
+    """产品名称、期初库存和全部每日数据的摘要，内容相同的产品摘要相同"""
+    values = list(map(_daily_values, product_data['days']))
+    return _content_hash(product_data['name'], product_data['opening_inventory'], np.array(values, dtype=np.float64))
+
+def product_content_hashes(
+    names: List[str], opening_inventories: np.ndarray, daily: Dict[str, np.ndarray]
+) -> List[str]:
+    """product_content_hash 的矩阵版本，daily 的格式同 summarize_product_matrices"""
+    n, days = np.shape(daily['inventory'])
+    day = np.broadcast_to(np.arange(1, days + 1), (n, days))
+    values = np.stack([day if key == 'day' else daily[key] for key in DAILY_VALUE_KEYS], axis=2).astype(np.float64)
+    return [
+        _content_hash(name, opening, values[i])
+        for i, (name, opening) in enumerate(zip(names, np.asarray(opening_inventories).tolist()))
+    ]
+
+# 支持 INSERT ... ON CONFLICT 的方言
+_UPSERT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+def _insert_products(db: Session, rows: List[Dict[str, Any]]):
+    """插入产品行；支持时按 products.id 做 upsert，其他写入者已插入同一产品时改为更新而不是违反主键约束"""
+    upsert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if upsert is None:
+        db.execute(insert(Product), rows)
+        return
+    statement = upsert(Product)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Product.id],
+        set_={key: statement.excluded[key] for key in ('name', 'opening_inventory', 'content_hash')}
+    )
+    db.execute(statement, rows)
+
+def _load_existing_days(db: Session, product_ids: List[str]) -> Dict[tuple, tuple]:
+    """查出产品已有的每日数据：(product_id, day) -> (id, *DAILY_VALUE_KEYS 中除 day 以外的值)"""
+    existing = {}
+    columns = [getattr(DailyData, key) for key in DAILY_VALUE_KEYS[1:]]
+    for chunk in _chunks(product_ids, IN_CLAUSE_CHUNK_SIZE):
+        rows = db.execute(
+            select(DailyData.product_id, DailyData.day, DailyData.id, *columns)
+            .where(DailyData.product_id.in_(chunk))
+        )
+        for product_id, day, row_id, *values in rows:
+            existing[(product_id, day)] = (row_id, *values)
+    return existing
+
+def save_excel_data_to_db(
+    excel_data: Dict[str, Any],
+    db: Session,
+    batch_size: int = BULK_INSERT_BATCH_SIZE,
+    commit: bool = True
+):
+    """
+    将Excel数据批量保存到数据库
+
+    每个产品的内容摘要保存在 products.content_hash 中。摘要未变的已有产品直接跳过；
+    变化的产品只更新值不同的天、插入新增的天、删除不再出现的天；新产品的每日数据通过
+    Core executemany 分批插入。产品汇总表和数据版本号随之更新。commit=False 时由调用方负责提交。
+
+    返回新增（products_count）、更新（updated_count）、跳过（skipped_count）的产品数，
+    写入（插入或更新）的每日数据行数 days_count 和删除的行数 days_deleted。
+    """
+    try:
+        # 同一个产品ID出现多次时以最后一次为准
+        products = list({p['id']: p for p in excel_data['products']}.values())
+        product_ids = [p['id'] for p in products]
+
+        # 一次性查出已存在的产品及其内容摘要
+        existing_hashes = {}
+        for chunk in _chunks(product_ids, IN_CLAUSE_CHUNK_SIZE):
+            existing_hashes.update(db.execute(
+                select(Product.id, Product.content_hash).where(Product.id.in_(chunk))
+            ).all())
+
+        hashes = {p['id']: product_content_hash(p) for p in products}
+        new_products = [p for p in products if p['id'] not in existing_hashes]
+        changed_products = [
+            p for p in products
+            if p['id'] in existing_hashes and existing_hashes[p['id']] != hashes[p['id']]
+        ]
+        skipped_count = len(products) - len(new_products) - len(changed_products)
+
+        # 写入产品信息
+        def product_row(p):
+            return {'id': p['id'], 'name': p['name'], 'opening_inventory': p['opening_inventory'],
+                    'content_hash': hashes[p['id']]}
+        if changed_products:
+            db.execute(update(Product), [product_row(p) for p in changed_products])
+        if new_products:
+            _insert_products(db, [product_row(p) for p in new_products])
+
+        # 变化的产品：逐天比较，只写入不同的天
+        daily_table = DailyData.__table__
+        changed_ids = [p['id'] for p in changed_products]
+        existing_days = _load_existing_days(db, changed_ids)
+        inserted_rows = []
+        updated_rows = []
+        for row in _iter_daily_rows(changed_products):
+            old = existing_days.pop((row['product_id'], row['day']), None)
+            if old is None:
+                inserted_rows.append(row)
+            elif old[1:] != tuple(row[key] for key in DAILY_VALUE_KEYS[1:]):
+                updated_rows.append({'id': old[0], **row})
+        # 剩下的是不再出现在表格中的天
+        deleted_ids = [old[0] for old in existing_days.values()]
+        for chunk in _chunks(deleted_ids, IN_CLAUSE_CHUNK_SIZE):
+            db.execute(delete(DailyData).where(DailyData.id.in_(chunk)))
+        for chunk in _chunks(updated_rows, batch_size):
+            db.execute(update(DailyData), chunk)
+        for chunk in _chunks(inserted_rows, batch_size):
+            db.execute(daily_table.insert(), chunk)
+        days_count = len(inserted_rows) + len(updated_rows)
+
+        # 新产品：分批插入每日数据
+        batch = []
+        for row in _iter_daily_rows(new_products):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                db.execute(daily_table.insert(), batch)
+                days_count += len(batch)
+                batch = []
+        if batch:
+            db.execute(daily_table.insert(), batch)
+            days_count += len(batch)
+
+        # 重写变化产品和新产品的汇总
+        for chunk in _chunks(changed_ids, IN_CLAUSE_CHUNK_SIZE):
+            db.execute(delete(ProductSummary).where(ProductSummary.product_id.in_(chunk)))
+        written_products = changed_products + new_products
+        if written_products:
+            db.execute(ProductSummary.__table__.insert(), [_summarize_product(p) for p in written_products])
+
+            # 与数据在同一事务中提交，读接口据此失效缓存的响应
+            bump_dataset_version(db)
+
+        if commit:
+            db.commit()
         return {
-            'products_count': products_count,
-            'days_count': days_count
+            'products_count': len(new_products),
+            'updated_count': len(changed_products),
+            'skipped_count': skipped_count,
+            'days_count': days_count,
+            'days_deleted': len(deleted_ids)
         }
     
     except Exception as e:
         db.rollback()
-        raise ValueError(f"Error saving to database: {str(e)}")
\ No newline at end of file
+        raise ValueError(f"Error saving to database: {str(e)}")
+
+def save_excel_stream_to_db(
+    batches: Iterable[List[Dict[str, Any]]],
+    db: Session,
+    batch_size: int = BULK_INSERT_BATCH_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+    commit: bool = True
+) -> Dict[str, int]:
+    """
+    逐批保存流式解析出的产品数据，全部写入后统一提交（commit=False 时由调用方负责提交）
+
+    progress 在每批写入后以累计的 (products_count, days_count) 调用。
+    """
+    totals = dict.fromkeys(SAVE_RESULT_KEYS, 0)
+    try:
+        for products in timed_iter(batches, 'parse'):
+            with upload_stage('save'):
+                result = save_excel_data_to_db({'products': products}, db, batch_size=batch_size, commit=False)
+            for key in SAVE_RESULT_KEYS:
+                totals[key] += result[key]
+            if progress:
+                progress(totals['products_count'], totals['days_count'])
+        if commit:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return totals
+
+def ingest_excel_file(
+    file_path: str,
+    db: Session,
+    streaming: Optional[bool] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    commit: bool = True
+) -> Dict[str, int]:
+    """
+    解析Excel文件并写入数据库
+
+    streaming 为空时，超过 STREAMING_THRESHOLD_BYTES 的 .xlsx 文件使用流式解析。
+    commit=False 时由调用方负责提交。
+    """
+    if streaming is None:
+        streaming = os.path.getsize(file_path) >= STREAMING_THRESHOLD_BYTES
+
+    if streaming and file_path.endswith('.xlsx'):
+        # 流式解析：逐批读取行并写入数据库
+        result = save_excel_stream_to_db(iter_excel_batches(file_path), db, progress=progress, commit=commit)
+    else:
+        with upload_stage('parse'):
+            excel_data = parse_excel_file(file_path)
+        with upload_stage('save'):
+            result = save_excel_data_to_db(excel_data, db, commit=commit)
+        if progress:
+            progress(result['products_count'], result['days_count'])
+    return result
@@ -0,0 +1,232 @@
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 为真时记录请求、SQL 和上传阶段的指标并开放 /metrics；关闭时不安装中间件和引擎事件，没有额外开销
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0").lower() in ("1", "true", "yes")
+
+# Response 会自动追加 "; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# 直方图的桶上界
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250)
+UPLOAD_STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[Any, ...]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+class Counter:
+    """按标签分组的计数器（Prometheus counter）"""
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self._values: Dict[Tuple[Any, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """按标签分组的累积直方图（Prometheus histogram），每个标签组合保存各桶计数和总和"""
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[Any, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        # 第一个上界 >= value 的桶；最后一个位置为 +Inf 桶，再后面是总和
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        bucket_names = self.label_names + ("le",)
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                label_text = _format_labels(bucket_names, labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests by route template and status code.", ("method", "route", "status")
+)
+http_request_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streaming the response body.",
+    ("method", "route"), LATENCY_BUCKETS
+)
+http_request_statements = Histogram(
+    "http_request_sql_statements", "SQL statements executed per HTTP request.", ("method", "route"), STATEMENT_BUCKETS
+)
+http_request_sql_seconds = Histogram(
+    "http_request_sql_duration_seconds", "Time spent executing SQL per HTTP request.",
+    ("method", "route"), LATENCY_BUCKETS
+)
+sql_statements = Counter("sql_statements_total", "SQL statements executed, including background jobs.")
+sql_seconds = Counter("sql_statement_duration_seconds_total", "Time spent executing SQL statements.")
+upload_stage_seconds = Histogram(
+    "upload_stage_duration_seconds", "Time spent per upload in each stage (receive, dedup, parse, save, commit).",
+    ("stage",), UPLOAD_STAGE_BUCKETS
+)
+
+METRICS = (
+    http_requests, http_request_seconds, http_request_statements, http_request_sql_seconds,
+    sql_statements, sql_seconds, upload_stage_seconds
+)
+
+def render_metrics() -> str:
+    """全部指标的 Prometheus 文本格式"""
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+# 当前请求的 [SQL 语句数, SQL 耗时]；线程池中执行的同步代码会复制上下文，因此共享同一个列表
+_request_sql: ContextVar[Optional[list]] = ContextVar("request_sql", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["metrics_statement_start"] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("metrics_statement_start", time.perf_counter())
+    sql_statements.inc()
+    sql_seconds.inc(elapsed)
+    stats = _request_sql.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += elapsed
+
+def instrument_engine(engine: Engine):
+    """统计引擎执行的 SQL 语句数和耗时（异步引擎传入 async_engine.sync_engine）"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+class MetricsMiddleware:
+    """
+    ASGI 中间件：按路由模板（如 /product/{product_id}）记录请求数、延迟和每个请求的 SQL 语句数及耗时
+
+    未匹配任何路由的请求记为 "unmatched"，避免按原始路径产生大量标签。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = [0, 0.0]
+        token = _request_sql.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_sql.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests.inc(1, method, route, status_code)
+            http_request_seconds.observe(elapsed, method, route)
+            http_request_statements.observe(stats[0], method, route)
+            http_request_sql_seconds.observe(stats[1], method, route)
+
+# 当前上传各阶段的累计耗时；上传结束时每个阶段记录一次
+_upload_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar("upload_stages", default=None)
+
+_NO_STAGE = nullcontext()
+
+@contextmanager
+def track_upload():
+    """统计一次上传（或后台导入任务）中各阶段的耗时，结束时写入 upload_stage_duration_seconds"""
+    if not METRICS_ENABLED:
+        yield
+        return
+    stages: Dict[str, float] = {}
+    token = _upload_stages.set(stages)
+    try:
+        yield
+    finally:
+        _upload_stages.reset(token)
+        for stage, seconds in stages.items():
+            upload_stage_seconds.observe(seconds, stage)
+
+@contextmanager
+def _timed_stage(stages: Dict[str, float], stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[stage] = stages.get(stage, 0.0) + time.perf_counter() - start
+
+def upload_stage(stage: str):
+    """把代码块的耗时计入当前上传的 stage 阶段；不在 track_upload 中时为空操作"""
+    stages = _upload_stages.get()
+    return _NO_STAGE if stages is None else _timed_stage(stages, stage)
+
+def _timed_iter(iterable: Iterable[Any], stages: Dict[str, float], stage: str) -> Iterator[Any]:
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            stages[stage] = stages.get(stage, 0.0) + time.perf_counter() - start
+        yield item
+
+def timed_iter(iterable: Iterable[Any], stage: str) -> Iterable[Any]:
+    """把逐批产出数据的耗时（如流式解析）计入当前上传的 stage 阶段"""
+    stages = _upload_stages.get()
+    return iterable if stages is None else _timed_iter(iterable, stages, stage)
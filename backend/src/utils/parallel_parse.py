@@ -0,0 +1,185 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from openpyxl import load_workbook
+from sqlalchemy.orm import Session
+from .excel_utils import (
+    REQUIRED_COLUMNS, STREAMING_THRESHOLD_BYTES, TEXT_COLUMN_DTYPES, _convert_excel_value,
+    _parse_products_frame, iter_excel_batches, save_excel_data_to_db, save_excel_stream_to_db, ingest_excel_file
+)
+from .csv_utils import is_csv_file, iter_csv_batches, parse_csv_file, ingest_csv_file
+from .metrics import upload_stage
+
+logger = logging.getLogger(__name__)
+
+# 解析进程数，默认与 CPU 核数相同
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    """进程池在第一次使用时创建并一直复用；使用 spawn 避免在多线程的服务进程中 fork"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+def list_sheets(file_path: str) -> List[str]:
+    """工作簿中所有工作表的名称"""
+    with pd.ExcelFile(file_path) as workbook:
+        return list(workbook.sheet_names)
+
+def _missing_columns(header) -> List[str]:
+    return [col for col in REQUIRED_COLUMNS if col not in header]
+
+def _log_skipped_sheet(file_path: str, sheet_name: str, missing: List[str]):
+    logger.warning(
+        "Skipping sheet '%s' of %s: missing required column(s) %s",
+        sheet_name, os.path.basename(file_path), ", ".join(missing)
+    )
+
+def list_product_sheets(file_path: str) -> List[str]:
+    """
+    以只读模式读取各工作表的表头，返回包含必需列的工作表名称；其余工作表（说明页、空表等）记录日志后跳过
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheets = []
+        for sheet in workbook.worksheets:
+            header = next(sheet.iter_rows(values_only=True, max_row=1), ())
+            missing = _missing_columns([_convert_excel_value(c) for c in header])
+            if missing:
+                _log_skipped_sheet(file_path, sheet.title, missing)
+            else:
+                sheets.append(sheet.title)
+        return sheets
+    finally:
+        workbook.close()
+
+def _parse_task(file_path: str, sheet_name: Optional[str]) -> Tuple[Optional[List[Dict[str, Any]]], List[str]]:
+    """
+    解析一个任务：CSV / TSV 文件整体为一个任务（sheet_name 为空），Excel 每个工作表一个任务
+
+    返回 (产品列表, 缺少的必需列)；工作表缺少必需列时产品列表为 None，由主进程记录日志后跳过。
+    """
+    if sheet_name is None:
+        return parse_csv_file(file_path), []
+    return parse_excel_sheet(file_path, sheet_name)
+
+def parse_excel_sheet(file_path: str, sheet_name: str) -> Tuple[Optional[List[Dict[str, Any]]], List[str]]:
+    """解析一个工作表，缺少必需列的工作表（包括空工作表）不解析；在子进程中执行"""
+    try:
+        df = pd.read_excel(file_path, sheet_name=sheet_name, dtype=TEXT_COLUMN_DTYPES)
+        missing = _missing_columns(df.columns)
+        if missing:
+            return None, missing
+        return _parse_products_frame(df), []
+    except Exception as e:
+        raise ValueError(f"Error parsing sheet '{sheet_name}' of {os.path.basename(file_path)}: {str(e)}")
+
+def _should_stream(file_path: str, streaming: Optional[bool]) -> bool:
+    """与 ingest_excel_file 相同的规则：显式要求或超过 STREAMING_THRESHOLD_BYTES 时流式解析 .xlsx 和 CSV / TSV 文件"""
+    if streaming is None:
+        streaming = os.path.getsize(file_path) >= STREAMING_THRESHOLD_BYTES
+    return streaming and (file_path.endswith('.xlsx') or is_csv_file(file_path))
+
+def iter_excel_files_batches(
+    file_paths: List[str],
+    streaming: Optional[bool] = None,
+    workers: Optional[int] = None
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    按文件和工作表的顺序逐批产出多个工作簿（以及 CSV / TSV 文件）的产品数据
+
+    需要流式解析的文件逐个工作表经 iter_excel_batches 读取，内存占用只与批大小有关；
+    其余工作表在进程池中并行解析，每个工作表为一批。缺少必需列的工作表记录日志后跳过，
+    全部工作表都被跳过时报错。
+    """
+    plan: List[Tuple[str, Optional[str], bool]] = []
+    for file_path in file_paths:
+        if is_csv_file(file_path):
+            plan.append((file_path, None, _should_stream(file_path, streaming)))
+        elif _should_stream(file_path, streaming):
+            plan.extend((file_path, sheet_name, True) for sheet_name in list_product_sheets(file_path))
+        else:
+            plan.extend((file_path, sheet_name, False) for sheet_name in list_sheets(file_path))
+
+    tasks = [(file_path, sheet_name) for file_path, sheet_name, streamed in plan if not streamed]
+    workers = PARSE_WORKERS if workers is None else workers
+    if len(tasks) <= 1 or workers <= 1:
+        results = (_parse_task(file_path, sheet_name) for file_path, sheet_name in tasks)
+    else:
+        pool = _get_pool()
+        futures = [pool.submit(_parse_task, file_path, sheet_name) for file_path, sheet_name in tasks]
+        results = (future.result() for future in futures)
+
+    parsed_sheets = 0
+    for file_path, sheet_name, streamed in plan:
+        if not streamed:
+            products, missing = next(results)
+            if products is None:
+                _log_skipped_sheet(file_path, sheet_name, missing)
+                continue
+            parsed_sheets += 1
+            yield products
+        elif sheet_name is None:
+            parsed_sheets += 1
+            yield from iter_csv_batches(file_path)
+        else:
+            parsed_sheets += 1
+            yield from iter_excel_batches(file_path, sheet_name=sheet_name)
+
+    if file_paths and not parsed_sheets:
+        raise ValueError(f"No sheet has the required columns: {', '.join(REQUIRED_COLUMNS)}")
+
+def parse_excel_files(file_paths: List[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    解析多个工作簿的全部工作表（以及 CSV / TSV 文件），各工作表在进程池中并行解析
+
+    结果按文件和工作表的顺序合并；同一产品ID出现多次时，保存时以最后一次为准。
+    """
+    return [
+        product
+        for batch in iter_excel_files_batches(file_paths, streaming=False, workers=workers)
+        for product in batch
+    ]
+
+def ingest_excel_files(
+    file_paths: List[str],
+    db: Session,
+    streaming: Optional[bool] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    commit: bool = True
+) -> Dict[str, int]:
+    """
+    解析多个Excel文件（每个文件的全部工作表）并写入数据库
+
+    只有一个文件且只有一个工作表时沿用 ingest_excel_file，只有一个 CSV / TSV 文件时分块解析并逐块写入。
+    要求流式解析或有文件超过 STREAMING_THRESHOLD_BYTES 时逐批写入，流式文件的每个工作表都经 iter_excel_batches
+    读取；否则全部解析后一次批量写入。
+    """
+    if len(file_paths) == 1 and is_csv_file(file_paths[0]):
+        return ingest_csv_file(file_paths[0], db, progress=progress, commit=commit)
+    if len(file_paths) == 1 and len(list_sheets(file_paths[0])) == 1:
+        return ingest_excel_file(file_paths[0], db, streaming, progress=progress, commit=commit)
+
+    if any(_should_stream(file_path, streaming) for file_path in file_paths):
+        batches = iter_excel_files_batches(file_paths, streaming)
+        return save_excel_stream_to_db(batches, db, progress=progress, commit=commit)
+
+    with upload_stage('parse'):
+        products = parse_excel_files(file_paths)
+    with upload_stage('save'):
+        result = save_excel_data_to_db({'products': products}, db, commit=commit)
+    if progress:
+        progress(result['products_count'], result['days_count'])
+    return result
@@ -0,0 +1,352 @@
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import Session, aliased
+from ..database import Product, DailyData, ProductSummary
+from .downsample import downsample_indices
+
+# /products/compare 一次最多对比的产品数
+MAX_COMPARE_PRODUCTS = 50
+
+# 降采样时 max_points 的下限
+MIN_MAX_POINTS = 10
+
+# /products 每页最多返回的产品数
+MAX_PRODUCTS_PAGE_SIZE = 1000
+
+# /products 可通过 fields 选择的字段
+PRODUCT_FIELDS = {
+    'id': Product.id,
+    'name': Product.name,
+    'opening_inventory': Product.opening_inventory
+}
+
+# 汇总粒度的别名（天数），天按序号计算，不对应日历
+ROLLUP_BUCKET_ALIASES = {
+    'week': 7,
+    'month': 30
+}
+
+# 汇总粒度的上限（天）
+MAX_ROLLUP_BUCKET = 3660
+
+# /products/summary 可排序的字段
+SUMMARY_SORT_COLUMNS = {
+    'id': Product.id,
+    'name': Product.name,
+    'days_count': ProductSummary.days_count,
+    'total_procurement': ProductSummary.total_procurement,
+    'total_sales': ProductSummary.total_sales,
+    'total_procurement_qty': ProductSummary.total_procurement_qty,
+    'total_sales_qty': ProductSummary.total_sales_qty,
+    'avg_inventory': ProductSummary.avg_inventory,
+    'min_inventory': ProductSummary.min_inventory,
+    'max_inventory': ProductSummary.max_inventory,
+    'stockout_days': ProductSummary.stockout_days,
+    'last_inventory': ProductSummary.last_inventory
+}
+
+def _day_range_filters(day_from: Optional[int], day_to: Optional[int]) -> list:
+    """构造按天范围过滤的条件"""
+    filters = []
+    if day_from is not None:
+        filters.append(DailyData.day >= day_from)
+    if day_to is not None:
+        filters.append(DailyData.day <= day_to)
+    return filters
+
+def _escape_like(value: str) -> str:
+    """转义 LIKE 中的通配符"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def load_product_page(
+    db: Session,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    search: Optional[str] = None,
+    match: str = 'contains',
+    fields: Optional[List[str]] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    按产品ID做游标（keyset）分页查询产品列表
+
+    after 为上一页最后一个产品ID；search 按名称前缀或子串匹配；fields 为需要返回的字段，
+    只查询这些列（id 总是返回）。返回 (产品列表, 下一页游标)，没有下一页时游标为空。
+    """
+    fields = [f for f in PRODUCT_FIELDS if f == 'id' or not fields or f in fields]
+    stmt = select(*(PRODUCT_FIELDS[f] for f in fields)).order_by(Product.id)
+    if after is not None:
+        stmt = stmt.where(Product.id > after)
+    if search:
+        pattern = _escape_like(search) + '%'
+        if match == 'contains':
+            pattern = '%' + pattern
+        stmt = stmt.where(Product.name.like(pattern, escape='\\'))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    items = [dict(zip(fields, row)) for row in db.execute(stmt)]
+    next_cursor = items[-1]['id'] if limit is not None and len(items) == limit else None
+    return items, next_cursor
+
+def _load_daily_rows(
+    db: Session,
+    product_ids: List[str],
+    day_from: Optional[int] = None,
+    day_to: Optional[int] = None
+) -> list:
+    """按 (product_id, day) 顺序查询产品的每日数据，金额在 SQL 中计算，返回 (产品ID, 天, 库存, 采购金额, 销售金额) 元组行"""
+    if not product_ids:
+        return []
+    return db.execute(
+        select(
+            DailyData.product_id,
+            DailyData.day,
+            DailyData.inventory,
+            DailyData.procurement_amount,
+            DailyData.sales_amount
+        )
+        .where(DailyData.product_id.in_(product_ids), *_day_range_filters(day_from, day_to))
+        .order_by(DailyData.product_id, DailyData.day)
+    ).all()
+
+def _downsample_rows(product_rows: list, max_points: int, method: str) -> list:
+    """按库存、采购金额和销售金额三条序列对一个产品的每日数据降采样"""
+    values = np.asarray([row[1:] for row in product_rows], dtype=np.float64)
+    days, ys = values[:, 0], values[:, 1:].T
+    return [product_rows[i] for i in downsample_indices(days, ys, max_points, method)]
+
+def _group_rows(
+    rows: list,
+    product_ids,
+    columnar: bool,
+    max_points: Optional[int] = None,
+    downsample: str = 'lttb'
+) -> Dict[str, Any]:
+    """
+    按产品分组每日数据
+
+    columnar 为真时每个产品返回 {day: [...], inventory: [...], procurement: [...], sales: [...]}，
+    否则返回每天一个对象的列表。指定 max_points 时每个产品最多保留 max_points 天。
+    """
+    grouped: Dict[str, list] = {product_id: [] for product_id in product_ids}
+    for row in rows:
+        grouped[row[0]].append(row)
+
+    if max_points:
+        for product_id, product_rows in grouped.items():
+            if len(product_rows) > max_points:
+                grouped[product_id] = _downsample_rows(product_rows, max_points, downsample)
+
+    if not columnar:
+        return {
+            product_id: [
+                {"day": day, "inventory": inventory, "procurement": procurement, "sales": sales}
+                for _, day, inventory, procurement, sales in product_rows
+            ]
+            for product_id, product_rows in grouped.items()
+        }
+
+    result = {}
+    for product_id, product_rows in grouped.items():
+        _, days, inventory, procurement, sales = zip(*product_rows) if product_rows else ((),) * 5
+        result[product_id] = {
+            "day": list(days),
+            "inventory": list(inventory),
+            "procurement": list(procurement),
+            "sales": list(sales)
+        }
+    return result
+
+def load_product_detail(
+    db: Session,
+    product_id: str,
+    columnar: bool = False,
+    max_points: Optional[int] = None,
+    downsample: str = 'lttb'
+) -> Optional[Dict[str, Any]]:
+    """加载单个产品及其每日数据，产品不存在时返回 None"""
+    product = db.execute(
+        select(Product.id, Product.name, Product.opening_inventory).where(Product.id == product_id)
+    ).first()
+    if product is None:
+        return None
+
+    rows = _load_daily_rows(db, [product_id])
+    days = _group_rows(rows, [product_id], columnar, max_points, downsample)[product_id]
+    return {
+        "id": product.id,
+        "name": product.name,
+        "opening_inventory": product.opening_inventory,
+        "days": days
+    }
+
+def load_products_days(
+    db: Session,
+    product_ids: List[str],
+    day_from: Optional[int] = None,
+    day_to: Optional[int] = None,
+    columnar: bool = False,
+    max_points: Optional[int] = None,
+    downsample: str = 'lttb'
+) -> List[Dict[str, Any]]:
+    """
+    用两条 IN 查询加载多个产品及其每日数据，按请求中的产品顺序返回，不存在的产品被忽略
+    """
+    names = dict(db.execute(
+        select(Product.id, Product.name).where(Product.id.in_(product_ids))
+    ).all())
+
+    rows = _load_daily_rows(db, list(names), day_from, day_to)
+    days_by_product = _group_rows(rows, names, columnar, max_points, downsample)
+
+    return [
+        {"id": product_id, "name": names[product_id], "days": days_by_product[product_id]}
+        for product_id in product_ids
+        if product_id in names
+    ]
+
+def load_product_summaries(
+    db: Session,
+    sort_by: str = 'total_sales',
+    descending: bool = True,
+    page: int = 1,
+    page_size: int = 50
+) -> Dict[str, Any]:
+    """
+    分页查询产品汇总表，只读取 products 和 product_summaries，不扫描 daily_data
+    """
+    sort_column = SUMMARY_SORT_COLUMNS[sort_by]
+    order = sort_column.desc() if descending else sort_column.asc()
+
+    total = db.execute(select(func.count()).select_from(ProductSummary)).scalar_one()
+    rows = db.execute(
+        select(Product.name, ProductSummary)
+        .join(Product, Product.id == ProductSummary.product_id)
+        # 以产品ID作为次级排序，保证分页稳定
+        .order_by(order, ProductSummary.product_id)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    ).all()
+
+    items = []
+    for name, summary in rows:
+        items.append({
+            "id": summary.product_id,
+            "name": name,
+            "days_count": summary.days_count,
+            "total_procurement_qty": summary.total_procurement_qty,
+            "total_sales_qty": summary.total_sales_qty,
+            "total_procurement": summary.total_procurement,
+            "total_sales": summary.total_sales,
+            "avg_inventory": summary.avg_inventory,
+            "min_inventory": summary.min_inventory,
+            "max_inventory": summary.max_inventory,
+            "stockout_days": summary.stockout_days,
+            "last_day": summary.last_day,
+            "last_inventory": summary.last_inventory
+        })
+
+    return {"total": total, "page": page, "page_size": page_size, "items": items}
+
+ROLLUP_FIELDS = (
+    'bucket', 'day_start', 'day_end', 'days',
+    'inventory_end', 'inventory_avg', 'inventory_min', 'procurement', 'sales'
+)
+
+def _load_rollup_rows(
+    db: Session,
+    product_ids: List[str],
+    bucket: int,
+    day_from: Optional[int] = None,
+    day_to: Optional[int] = None
+) -> list:
+    """
+    在 SQL 中按 bucket 天分组汇总每日数据，返回 (产品ID, *ROLLUP_FIELDS) 元组行
+
+    第 k 个桶（从 0 开始）包含第 k * bucket + 1 到 (k + 1) * bucket 天，与查询的日期范围无关，
+    期末库存取桶内最后一天的库存。
+    """
+    if not product_ids:
+        return []
+    bucket_index = ((DailyData.day - 1) // bucket).label('bucket')
+    buckets = (
+        select(
+            DailyData.product_id,
+            bucket_index,
+            func.min(DailyData.day).label('day_start'),
+            func.max(DailyData.day).label('day_end'),
+            func.count().label('days'),
+            func.avg(DailyData.inventory).label('inventory_avg'),
+            func.min(DailyData.inventory).label('inventory_min'),
+            func.sum(DailyData.procurement_amount).label('procurement'),
+            func.sum(DailyData.sales_amount).label('sales')
+        )
+        .where(DailyData.product_id.in_(product_ids), *_day_range_filters(day_from, day_to))
+        .group_by(DailyData.product_id, bucket_index)
+        .subquery()
+    )
+    # 通过 (product_id, day) 唯一索引取每个桶最后一天的库存
+    last_day = aliased(DailyData)
+    return db.execute(
+        select(
+            buckets.c.product_id,
+            buckets.c.bucket,
+            buckets.c.day_start,
+            buckets.c.day_end,
+            buckets.c.days,
+            last_day.inventory,
+            buckets.c.inventory_avg,
+            buckets.c.inventory_min,
+            buckets.c.procurement,
+            buckets.c.sales
+        )
+        .join(last_day, and_(last_day.product_id == buckets.c.product_id, last_day.day == buckets.c.day_end))
+        .order_by(buckets.c.product_id, buckets.c.bucket)
+    ).all()
+
+def load_products_rollup(
+    db: Session,
+    product_ids: List[str],
+    bucket: int,
+    day_from: Optional[int] = None,
+    day_to: Optional[int] = None,
+    columnar: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    按 bucket 天汇总多个产品的库存（期末/平均/最低）、采购金额和销售金额，按请求中的产品顺序返回，不存在的产品被忽略
+
+    columnar 为真时每个产品的 buckets 为 {字段: [...]}，否则为每个桶一个对象的列表。
+    """
+    names = dict(db.execute(
+        select(Product.id, Product.name).where(Product.id.in_(product_ids))
+    ).all())
+
+    grouped: Dict[str, list] = {product_id: [] for product_id in names}
+    for row in _load_rollup_rows(db, list(names), bucket, day_from, day_to):
+        grouped[row[0]].append(row[1:])
+
+    result = []
+    for product_id in product_ids:
+        if product_id not in names:
+            continue
+        rows = grouped[product_id]
+        if columnar:
+            columns = zip(*rows) if rows else ((),) * len(ROLLUP_FIELDS)
+            buckets = {field: list(values) for field, values in zip(ROLLUP_FIELDS, columns)}
+        else:
+            buckets = [dict(zip(ROLLUP_FIELDS, row)) for row in rows]
+        result.append({"id": product_id, "name": names[product_id], "bucket_days": bucket, "buckets": buckets})
+    return result
+
+def load_product_rollup(
+    db: Session,
+    product_id: str,
+    bucket: int,
+    day_from: Optional[int] = None,
+    day_to: Optional[int] = None,
+    columnar: bool = False
+) -> Optional[Dict[str, Any]]:
+    """按 bucket 天汇总单个产品的每日数据，产品不存在时返回 None"""
+    result = load_products_rollup(db, [product_id], bucket, day_from, day_to, columnar)
+    return result[0] if result else None
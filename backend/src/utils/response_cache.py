@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+from pydantic import TypeAdapter
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import Session
+from ..database import DatasetVersion
+
+# 响应缓存容量：条目数和序列化后的总字节数
+RESPONSE_CACHE_ENTRIES = int(os.getenv("RESPONSE_CACHE_ENTRIES", "512"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    headers: Dict[str, str]
+
+class ResponseCache:
+    """线程安全的 LRU 缓存，按条目数和总字节数限制容量；键中包含数据版本号，导入后旧条目自然淘汰"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, entry: CachedResponse):
+        # 单个响应超过总容量的四分之一时不缓存，避免挤掉其他所有条目
+        if len(entry.body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size_bytes -= len(old.body)
+            self._data[key] = entry
+            self.size_bytes += len(entry.body)
+            while len(self._data) > self.max_entries or self.size_bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.size_bytes -= len(evicted.body)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "size_bytes": self.size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+# (接口, 参数, 数据版本) -> 序列化后的响应
+response_cache = ResponseCache(RESPONSE_CACHE_ENTRIES, RESPONSE_CACHE_MAX_BYTES)
+
+def get_dataset_version(db: Session) -> int:
+    """当前数据版本号；与后续查询在同一事务中读取，保证版本号与数据一致"""
+    return db.execute(select(DatasetVersion.version).where(DatasetVersion.id == 1)).scalar() or 0
+
+def bump_dataset_version(db: Session):
+    """数据版本号加一，随导入的事务一起提交"""
+    result = db.execute(
+        update(DatasetVersion)
+        .where(DatasetVersion.id == 1)
+        .values(version=DatasetVersion.version + 1, updated_at=func.now())
+    )
+    if result.rowcount == 0:
+        db.add(DatasetVersion(id=1, version=1))
+
+@lru_cache(maxsize=None)
+def _type_adapter(model) -> TypeAdapter:
+    return TypeAdapter(model)
+
+def serialize_json(content: Any, model=None) -> bytes:
+    """序列化为 JSON；给出 model 时先按响应模型校验和过滤字段，与 response_model 的行为一致"""
+    if model is not None:
+        adapter = _type_adapter(model)
+        return adapter.dump_json(adapter.validate_python(content))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def make_cached_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+    """由响应内容计算强 ETag"""
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return CachedResponse(body, etag, headers or {})
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 是否命中（按 RFC 9110 使用弱比较）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
@@ -0,0 +1,139 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+# 同时执行的导入任务数；导入由 ingest_lock 串行化，多个后台线程只会在锁上等待
+UPLOAD_WORKERS = 1
+
+# 排队和执行中的任务总数上限，超过后拒绝新任务
+UPLOAD_QUEUE_LIMIT = 8
+
+# 保留的已结束任务数量
+FINISHED_JOBS_KEEP = 200
+
+# 进程级导入锁：同步上传、后台任务和 Parquet 导入都在持有该锁时写库，同一时间只有一个导入写数据库。
+# 否则两个导入会同时把同一批产品当作新产品插入，SQLite 上长时间持有写锁的导入还会让另一个超时
+ingest_lock = threading.Lock()
+
+class UploadQueueFull(Exception):
+    """导入队列已满"""
+
+class UploadJob:
+    """一次后台导入任务的状态"""
+
+    def __init__(self, filename: str, owner: str):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.owner = owner
+        self.status = 'queued'
+        self.products_count = 0
+        self.days_count = 0
+        self.updated_count = 0
+        self.skipped_count = 0
+        self.error: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._started = None
+        self._finished = None
+
+    def update_progress(self, products_count: int, days_count: int):
+        """记录已写入的产品数和每日数据行数"""
+        self.products_count = products_count
+        self.days_count = days_count
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.perf_counter()) - self._started
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.days_count / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'products_count': self.products_count,
+            'days_count': self.days_count,
+            'updated_count': self.updated_count,
+            'skipped_count': self.skipped_count,
+            'rows_per_second': round(self.rows_per_second, 1),
+            'elapsed_seconds': round(self.elapsed_seconds, 3),
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+class UploadJobQueue:
+    """
+    有界的后台导入任务池
+
+    最多 workers 个任务并行执行，排队加执行中的任务数超过 limit 时 submit 抛出 UploadQueueFull。
+    """
+
+    def __init__(self, workers: int = UPLOAD_WORKERS, limit: int = UPLOAD_QUEUE_LIMIT,
+                 keep_finished: int = FINISHED_JOBS_KEEP):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='upload-job')
+        self._slots = threading.BoundedSemaphore(limit)
+        self._jobs: "OrderedDict[str, UploadJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._keep_finished = keep_finished
+
+    def submit(self, filename: str, owner: str, fn: Callable[[UploadJob], Dict[str, int]]) -> UploadJob:
+        """提交任务，fn 在后台线程中以任务对象为参数执行并返回导入结果"""
+        if not self._slots.acquire(blocking=False):
+            raise UploadQueueFull("Upload queue is full")
+        job = UploadJob(filename, owner)
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            self._executor.submit(self._run, job, fn)
+        except Exception:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            self._slots.release()
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[UploadJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: UploadJob, fn: Callable[[UploadJob], Dict[str, int]]):
+        job.status = 'running'
+        job.started_at = datetime.now(timezone.utc)
+        job._started = time.perf_counter()
+        try:
+            result = fn(job)
+            job.update_progress(result['products_count'], result['days_count'])
+            job.updated_count = result.get('updated_count', 0)
+            job.skipped_count = result.get('skipped_count', 0)
+            job.status = 'succeeded'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+        finally:
+            job._finished = time.perf_counter()
+            job.finished_at = datetime.now(timezone.utc)
+            self._slots.release()
+            self._prune()
+
+    def _prune(self):
+        """只保留最近的 keep_finished 个已结束任务"""
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.status in ('succeeded', 'failed')]
+            for job_id in finished[:max(0, len(finished) - self._keep_finished)]:
+                del self._jobs[job_id]
+
+# 全局任务队列
+upload_job_queue = UploadJobQueue()
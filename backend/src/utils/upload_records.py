@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional
+from sqlalchemy.orm import Session
+from ..database import UploadRecord
+from .excel_utils import SAVE_RESULT_KEYS
+from .response_cache import get_dataset_version
+
+def find_previous_upload(db: Session, digest: str) -> Optional[Dict[str, Any]]:
+    """
+    查找相同内容文件的导入结果
+
+    只有导入之后数据没有再被修改（数据版本号未变）时才返回结果；否则再次导入会改变数据，需要重新处理。
+    """
+    record = db.get(UploadRecord, digest)
+    if record is None or record.dataset_version != get_dataset_version(db):
+        return None
+    return {key: getattr(record, key) for key in SAVE_RESULT_KEYS}
+
+def record_upload(db: Session, digest: str, filename: str, result: Dict[str, Any]):
+    """记录文件摘要和导入结果；应在导入的事务提交前调用，使记录的版本号与本次导入一致"""
+    db.merge(UploadRecord(
+        digest=digest,
+        filename=filename,
+        dataset_version=get_dataset_version(db),
+        **{key: result[key] for key in SAVE_RESULT_KEYS}
+    ))
@@ -0,0 +1,31 @@
+import hashlib
+import os
+import tempfile
+from typing import Tuple
+from fastapi import UploadFile
+
+# 上传文件每次读取的块大小
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+async def save_upload_to_temp(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> Tuple[str, str]:
+    """
+    分块将上传文件写入临时文件，同时计算内容的 SHA-256，返回 (临时文件路径, 十六进制摘要)
+    """
+    root, suffix = os.path.splitext(file.filename or '')
+    # 压缩文件保留内层扩展名（如 .csv.gz），以便按扩展名识别格式
+    if suffix.lower() == '.gz':
+        suffix = os.path.splitext(root)[1] + suffix
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        try:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                tmp_file.write(chunk)
+        except Exception:
+            tmp_file.close()
+            os.unlink(tmp_file.name)
+            raise
+    return tmp_file.name, digest.hexdigest()
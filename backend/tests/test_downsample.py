@@ -0,0 +1,86 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.downsample import downsample_indices, lttb_indices, minmax_bucket_size, minmax_indices
+
+
+def synthetic_series(days: int, seed: int):
+    """Random-walk inventory with sparse procurement spikes and noisy sales (as in bench_downsample)"""
+    rng = np.random.default_rng(seed)
+    procurement_qty = rng.integers(0, 200, size=days) * (rng.random(days) < 0.1)
+    sales_qty = rng.poisson(15, size=days)
+    inventory = 1000 + np.cumsum(procurement_qty - sales_qty)
+    procurement = procurement_qty * rng.uniform(2.0, 4.0, size=days)
+    sales = sales_qty * rng.uniform(4.0, 6.0, size=days)
+    return np.arange(1, days + 1), np.vstack([inventory, procurement, sales]).astype(np.float64)
+
+
+CASES = [(days, max_points, seed) for days in (503, 5000, 20000) for max_points in (50, 500) for seed in (0, 1)]
+
+
+def check_common(idx, n, max_points):
+    assert len(idx) <= max_points
+    assert np.all(np.diff(idx) > 0)
+    assert idx[0] == 0 and idx[-1] == n - 1
+
+
+@pytest.mark.parametrize("days,max_points,seed", CASES)
+def test_minmax_keeps_every_bucket_extreme(days, max_points, seed):
+    x, ys = synthetic_series(days, seed)
+    idx = minmax_indices(ys, max_points)
+    check_common(idx, days, max_points)
+
+    bucket_size = minmax_bucket_size(days, len(ys), max_points)
+    kept = np.zeros(days, dtype=bool)
+    kept[idx] = True
+    for start in range(1, days - 1, bucket_size):
+        end = min(start + bucket_size, days - 1)
+        in_bucket = kept[start:end]
+        for y in ys:
+            assert y[start:end][in_bucket].max() == y[start:end].max()
+            assert y[start:end][in_bucket].min() == y[start:end].min()
+
+
+@pytest.mark.parametrize("days,max_points,seed", CASES)
+def test_lttb_error_bound(days, max_points, seed):
+    x, ys = synthetic_series(days, seed)
+    idx = lttb_indices(x, ys, max_points)
+    check_common(idx, days, max_points)
+    assert len(idx) == max_points
+
+    # One original point per bucket, so consecutive kept points are at most two bucket widths apart
+    bucket_width = -(-(days - 2) // (max_points - 2))
+    assert np.diff(idx).max() <= 2 * bucket_width
+
+    # Linear interpolation between kept points is off by at most the range of the original values between them
+    for y in ys:
+        approx = np.interp(x, x[idx], y[idx])
+        for a, b in zip(idx[:-1], idx[1:]):
+            segment = y[a:b + 1]
+            assert np.abs(approx[a:b + 1] - segment).max() <= segment.max() - segment.min() + 1e-9
+        np.testing.assert_array_equal(approx[idx], y[idx])
+
+
+def test_lttb_reproduces_linear_series_exactly():
+    x = np.arange(1, 10001)
+    ys = np.vstack([3.0 * x + 7, -0.5 * x])
+    idx = lttb_indices(x, ys, 200)
+    for y in ys:
+        np.testing.assert_allclose(np.interp(x, x[idx], y[idx]), y)
+
+
+@pytest.mark.parametrize("method", ['lttb', 'minmax'])
+def test_short_series_is_not_downsampled(method):
+    x, ys = synthetic_series(100, 0)
+    np.testing.assert_array_equal(downsample_indices(x, ys, 500, method), np.arange(100))
+
+
+def test_unknown_method():
+    x, ys = synthetic_series(100, 0)
+    with pytest.raises(ValueError):
+        downsample_indices(x, ys, 50, 'average')
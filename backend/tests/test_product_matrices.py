@@ -0,0 +1,60 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.utils.excel_utils import (
+    DAILY_VALUE_KEYS, _summarize_product, product_content_hash, product_content_hashes, summarize_product_matrices
+)
+
+
+def random_matrices(products: int, days: int, seed: int = 0):
+    """Daily (products, days) matrices with stockouts, fractional prices and zero-price days"""
+    rng = np.random.default_rng(seed)
+    procurement_qty = rng.integers(0, 50, (products, days)) * (rng.random((products, days)) < 0.3)
+    sales_qty = rng.integers(0, 20, (products, days))
+    return {
+        'ids': [str(i + 1) for i in range(products)],
+        'names': [f"PRODUCT {i}" for i in range(products)],
+        'opening': rng.integers(0, 100, products),
+        'inventory': rng.integers(-20, 200, (products, days)),
+        'procurement_qty': procurement_qty,
+        'procurement_price': np.where(procurement_qty > 0, np.round(rng.uniform(0.5, 20.0, (products, days)), 2), 0.0),
+        'sales_qty': sales_qty,
+        'sales_price': np.round(rng.uniform(1.0, 30.0, (products, days)), 2),
+    }
+
+
+def as_products(data):
+    """The same data as the product dicts the Excel parser produces"""
+    products = []
+    for i, product_id in enumerate(data['ids']):
+        days = [
+            dict(zip(DAILY_VALUE_KEYS, (day + 1, *(data[key][i, day].item() for key in DAILY_VALUE_KEYS[1:]))))
+            for day in range(data['inventory'].shape[1])
+        ]
+        products.append({
+            'id': product_id, 'name': data['names'][i], 'opening_inventory': int(data['opening'][i]), 'days': days
+        })
+    return products
+
+
+@pytest.mark.parametrize("days", [0, 1, 30])
+def test_summaries_match_per_product(days):
+    data = random_matrices(20, days)
+    for summary, product in zip(summarize_product_matrices(data['ids'], data), as_products(data)):
+        expected = _summarize_product(product)
+        assert summary.keys() == expected.keys()
+        for key, value in expected.items():
+            assert summary[key] == pytest.approx(value), key
+
+
+@pytest.mark.parametrize("days", [0, 1, 30])
+def test_content_hashes_match_per_product(days):
+    data = random_matrices(20, days)
+    hashes = product_content_hashes(data['names'], data['opening'], data)
+    assert hashes == [product_content_hash(product) for product in as_products(data)]
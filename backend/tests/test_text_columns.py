@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.utils.excel_utils import DAY_COLUMN_TEMPLATES, iter_excel_batches, parse_excel_file
+from src.utils.csv_utils import iter_csv_batches
+from src.utils.parallel_parse import parse_excel_files
+
+# Zero-padded text IDs, text SKUs, numeric IDs (an integral float cell included) and numeric product names
+IDS = ['0000001', 'SKU-2', 3, 4.0, '0005', ' 6 ']
+NAMES = ['CHERRY', 'RAMEN', 12345, 'TOFU', '007', 'RICE']
+EXPECTED_IDS = ['0000001', 'SKU-2', '3', '4', '0005', '6']
+EXPECTED_NAMES = ['CHERRY', 'RAMEN', '12345', 'TOFU', '007', 'RICE']
+
+
+def mixed_frame(ids=IDS):
+    columns = {'ID': ids, 'Product Name': NAMES, 'Opening Inventory': [10] * len(IDS)}
+    for field, template in DAY_COLUMN_TEMPLATES.items():
+        columns[template.format(1)] = [1] * len(IDS)
+    return pd.DataFrame(columns)
+
+
+@pytest.fixture
+def mixed_workbook(tmp_path):
+    path = str(tmp_path / 'mixed.xlsx')
+    mixed_frame().to_excel(path, index=False)
+    return path
+
+
+def mixed_csv(path):
+    """The mixed sheet as Excel exports it: a CSV has no numeric cells, the integral 4.0 is written as 4"""
+    frame = mixed_frame([int(value) if isinstance(value, float) else value for value in IDS])
+    frame.to_csv(path, index=False)
+    return frame
+
+
+def ids_and_names(products):
+    return [p['id'] for p in products], [p['name'] for p in products]
+
+
+def test_full_parse_keeps_text_ids(mixed_workbook):
+    assert ids_and_names(parse_excel_file(mixed_workbook)['products']) == (EXPECTED_IDS, EXPECTED_NAMES)
+
+
+@pytest.mark.parametrize("batch_rows", [1, 2, 4, 1000])
+def test_streaming_matches_full_parse(mixed_workbook, batch_rows):
+    products = [p for batch in iter_excel_batches(mixed_workbook, batch_rows=batch_rows) for p in batch]
+    assert products == parse_excel_file(mixed_workbook)['products']
+
+
+def test_sheet_parse_matches_full_parse(mixed_workbook):
+    assert parse_excel_files([mixed_workbook], workers=1) == parse_excel_file(mixed_workbook)['products']
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 1000])
+def test_csv_chunks_match_workbook(mixed_workbook, tmp_path, chunk_rows):
+    path = str(tmp_path / 'mixed.csv')
+    mixed_csv(path)
+    products = [p for batch in iter_csv_batches(path, chunk_rows=chunk_rows) for p in batch]
+    assert products == parse_excel_file(mixed_workbook)['products']
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 3, 1000])
+def test_csv_blank_id_does_not_change_other_ids(tmp_path, chunk_rows):
+    path = str(tmp_path / 'blank.csv')
+    frame = mixed_csv(path)
+    frame.loc[2, 'ID'] = None
+    frame.to_csv(path, index=False)
+    products = [p for batch in iter_csv_batches(path, chunk_rows=chunk_rows) for p in batch]
+    assert [p['id'] for p in products] == EXPECTED_IDS[:2] + [''] + EXPECTED_IDS[3:]
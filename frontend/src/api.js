@@ -87,11 +87,25 @@ export async function compareProducts(productIds) {
   return apiRequest(`/products/compare?product_ids=${ids}`);
 }
 
-// Excel上传API
+// 按桶汇总（bucket 为天数或 week / month）
+export async function getProductRollup(pid, bucket = 7) {
+  return apiRequest(`/product/${pid}/rollup?bucket=${bucket}`);
+}
+
+export async function getProductsRollup(productIds, bucket = 7) {
+  const ids = Array.isArray(productIds) ? productIds.join(',') : productIds;
+  return apiRequest(`/products/rollup?product_ids=${ids}&bucket=${bucket}`);
+}
+
+// Excel上传API（file 可以是多个文件组成的数组）
 export async function uploadExcel(file) {
   const token = getToken();
   const formData = new FormData();
-  formData.append('file', file);
+  if (Array.isArray(file)) {
+    file.forEach((f) => formData.append('files', f));
+  } else {
+    formData.append('file', file);
+  }
 
   const response = await fetch(`${BASE}/upload-excel`, {
     method: 'POST',
@@ -34,10 +34,11 @@ export default function ExcelUpload({ onUploadSuccess }) {
     const isExcel = file.type === 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' || 
                    file.type === 'application/vnd.ms-excel' ||
                    file.name.endsWith('.xlsx') || 
-                   file.name.endsWith('.xls');
+                   file.name.endsWith('.xls') ||
+                   /\.(csv|tsv)(\.gz)?$/i.test(file.name);
     
     if (!isExcel) {
-      antdMessage.error('Please select an Excel file (.xlsx or .xls)');
+      antdMessage.error('Please select an Excel or CSV file (.xlsx, .xls, .csv or .tsv)');
       return Upload.LIST_IGNORE;
     }
     
@@ -81,7 +82,7 @@ export default function ExcelUpload({ onUploadSuccess }) {
   const uploadProps = {
     name: 'file',
     multiple: false,
-    accept: '.xlsx,.xls',
+    accept: '.xlsx,.xls,.csv,.tsv,.gz',
     fileList,
     beforeUpload,
     onChange: (info) => {
@@ -133,7 +134,7 @@ export default function ExcelUpload({ onUploadSuccess }) {
               </p>
               <p className="ant-upload-hint">
                 <Text type="secondary">
-                  Support .xlsx and .xls formats, maximum file size 10MB
+                  Support .xlsx, .xls, .csv and .tsv (optionally .gz) formats, maximum file size 10MB
                 </Text>
               </p>
             </Dragger>